@@ -0,0 +1,178 @@
+"""
+Performance benchmarks
+
+Times the hand evaluator (Game.rank_hand and evaluator.evaluate), deck
+shuffling and dealing, Game.check_straight and full hands played by
+non-interactive agents on the headless engine. Every benchmark runs once per
+seed on inputs generated from that seed, so runs on different commits measure
+the same work.
+
+Results are printed and can be saved as JSON and compared with an earlier run:
+
+    python -m src.benchmark --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+
+from src.game.agents import RandomAgent
+from src.game.card import CARDS
+from src.game.deck import Deck
+from src.game.engine import HeadlessGame
+import src.game.evaluator as evaluator
+from src.game.game import Game
+
+DEFAULT_SEEDS = (1, 2, 3)
+
+def _random_hands(rng, count, size=7):
+    """Returns count random hands of size distinct cards."""
+    return [rng.sample(CARDS, size) for _ in range(count)]
+
+def bench_rank_hand(seed, count):
+    """Ranks count random 7-card hands with Game.rank_hand."""
+    hands = _random_hands(random.Random(seed), count)
+    rank_hand = Game([]).rank_hand
+    start = time.perf_counter()
+    for hand in hands:
+        rank_hand(hand)
+    return count, time.perf_counter() - start
+
+def bench_evaluate(seed, count):
+    """Evaluates count random 7-card hands of card codes with evaluator.evaluate."""
+    hands = [[card.code for card in hand] for hand in _random_hands(random.Random(seed), count)]
+    evaluate = evaluator.evaluate
+    start = time.perf_counter()
+    for hand in hands:
+        evaluate(hand)
+    return count, time.perf_counter() - start
+
+def bench_check_straight(seed, count):
+    """Runs Game.check_straight on the ranks of count random 7-card hands."""
+    ranks = [[card.rank for card in hand] for hand in _random_hands(random.Random(seed), count)]
+    check_straight = Game([]).check_straight
+    start = time.perf_counter()
+    for hand_ranks in ranks:
+        check_straight(hand_ranks)
+    return count, time.perf_counter() - start
+
+def bench_shuffle(seed, count):
+    """Shuffles a seeded deck count times."""
+    deck = Deck(random.Random(seed))
+    start = time.perf_counter()
+    for _ in range(count):
+        deck.shuffle()
+    return count, time.perf_counter() - start
+
+def bench_deal(seed, count):
+    """Deals count cards, 52 at a time from a seeded shuffled deck."""
+    deck = Deck(random.Random(seed))
+    deck.shuffle()
+    rounds = count // len(deck)
+    deal = deck.deal
+    start = time.perf_counter()
+    for _ in range(rounds):
+        deck.reset()
+        while deal() is not None:
+            pass
+    return rounds * len(deck.cards), time.perf_counter() - start
+
+def bench_hands(seed, count, num_players=6, stack=1000):
+    """Plays count full hands between seeded RandomAgents, rebuying busted players."""
+    game = HeadlessGame([stack] * num_players, rng=random.Random(seed))
+    agents = [RandomAgent(random.Random(f"{seed}-{seat}")) for seat in range(num_players)]
+    start = time.perf_counter()
+    for _ in range(count):
+        for player in game.players:
+            if player.chips == 0:
+                player.chips = stack
+        game.play_hand(agents)
+    return count, time.perf_counter() - start
+
+# name: (function, unit, work per seed at scale 1)
+BENCHMARKS = {
+    'rank_hand': (bench_rank_hand, 'evals/s', 100000),
+    'evaluate': (bench_evaluate, 'evals/s', 200000),
+    'check_straight': (bench_check_straight, 'checks/s', 100000),
+    'deck_shuffle': (bench_shuffle, 'shuffles/s', 20000),
+    'deck_deal': (bench_deal, 'cards/s', 520000),
+    'hands': (bench_hands, 'hands/s', 5000),
+}
+
+def _commit():
+    """Returns the current git commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(names=None, seeds=DEFAULT_SEEDS, scale=1.0):
+    """Runs the named (default all) benchmarks once per seed and returns the
+    results as a JSON-serializable dict."""
+    results = {}
+    for name in names or BENCHMARKS:
+        function, unit, count = BENCHMARKS[name]
+        count = max(1, int(count * scale))
+        rates = []
+        for seed in seeds:
+            done, seconds = function(seed, count)
+            rates.append(done / seconds)
+        results[name] = {
+            'unit': unit,
+            'count': count,
+            'rates': rates,
+            'mean': sum(rates) / len(rates),
+            'best': max(rates),
+        }
+    return {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seeds': list(seeds),
+        'scale': scale,
+        'results': results,
+    }
+
+def compare(current, baseline):
+    """Returns lines giving the change in mean rate of each benchmark in both runs."""
+    lines = []
+    for name, result in current['results'].items():
+        if name in baseline['results']:
+            before = baseline['results'][name]['mean']
+            change = 100 * (result['mean'] / before - 1)
+            lines.append(f"{name:>15}: {before:14,.0f} -> {result['mean']:14,.0f} {result['unit']} ({change:+.1f}%)")
+    return lines
+
+def main():
+    """Parses command-line options, runs the benchmarks and reports the results."""
+    parser = argparse.ArgumentParser(description="Texas Hold'em performance benchmarks")
+    parser.add_argument('names', nargs='*', metavar='name',
+                        help=f"benchmarks to run (default all): {', '.join(BENCHMARKS)}")
+    parser.add_argument('--seeds', type=int, nargs='+', default=list(DEFAULT_SEEDS))
+    parser.add_argument('--scale', type=float, default=1.0, help="multiplies the work done per seed")
+    parser.add_argument('--output', help="save the results to this JSON file")
+    parser.add_argument('--compare', help="compare against results saved by an earlier run")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    report = run(args.names, args.seeds, args.scale)
+    for name, result in report['results'].items():
+        print(f"{name:>15}: {result['mean']:14,.0f} {result['unit']} (best {result['best']:,.0f})")
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print(f"Compared with {baseline.get('commit') or args.compare}:")
+        for line in compare(report, baseline):
+            print(line)
+
+if __name__ == "__main__":
+    main()
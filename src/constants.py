@@ -5,7 +5,12 @@ Contains constants for the poker game.
 # Deck attributes
 RANKS = (2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14)
 SUITS = ('Spades', 'Diamonds', 'Hearts', 'Clubs')
+RANK_KEYS = '23456789TJQKA'  # Short keys, in RANKS order, used for card images
+SUIT_KEYS = 'sdhc'           # Short keys, in SUITS order
 CARD_IMAGES_DIR = "./src/resources/deck/"
+BACKGROUND_PATH = "./src/resources/table.png"
+ASSET_CACHE_DIR = "./src/resources/cache/"  # Built sprite atlas and scaled backgrounds
+PREFLOP_TABLE_PATH = "./src/resources/preflop_equity.npy"
 
 # Game attributes
 HANDS = {1: "High Card",
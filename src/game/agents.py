@@ -0,0 +1,31 @@
+"""
+Non-interactive agents for the headless engine
+
+An agent is any callable that takes a Decision (see src.game.engine) and
+returns an action name, or an (action, amount) tuple for 'bet'.
+"""
+
+import random
+
+def call_agent(decision):
+    """Checks when possible and calls otherwise; never folds or raises."""
+    return 'check' if 'check' in decision.legal_actions else 'call'
+
+def fold_agent(decision):
+    """Checks when possible and folds to any bet."""
+    return 'check' if 'check' in decision.legal_actions else 'fold'
+
+class RandomAgent:
+    """Picks uniformly among the legal actions, betting between the minimum
+    bet and twice that amount."""
+
+    def __init__(self, rng=None):
+        """Creates an agent drawing from rng (a random.Random), or a fresh one."""
+        self.rng = rng if rng is not None else random.Random()
+
+    def __call__(self, decision):
+        """Chooses an action for the decision."""
+        action = self.rng.choice(decision.legal_actions)
+        if action == 'bet':
+            return 'bet', self.rng.randint(decision.min_bet, 2 * decision.min_bet)
+        return action
@@ -0,0 +1,203 @@
+"""
+Board texture and draw analysis
+
+Describes a flop or turn for an advisor: the board's texture, the draws
+that hole cards make on it (flush draws, open-ended and gutshot straight
+draws, backdoor draws), the outs that improve the hand, and the probability
+of hitting one by the turn and by the river.
+
+Straight draws use the same windows of five ranks as Game.check_straight,
+applied to 13-bit rank masks; the ranks that complete a straight are
+memoized per rank mask. Hit probabilities come from tables precomputed at
+import for every count of unseen cards and outs, so an analysis is a few
+dozen table lookups and evaluations, well under a millisecond.
+"""
+
+from functools import lru_cache
+from math import comb
+
+from src.constants import RANK_KEYS
+from src.game.equity import to_codes
+import src.game.evaluator as evaluator
+
+# Draw classes
+FLUSH_DRAW = 'flush draw'
+OPEN_ENDED = 'open-ended straight draw'
+DOUBLE_GUTSHOT = 'double gutshot'
+GUTSHOT = 'gutshot'
+BACKDOOR_FLUSH = 'backdoor flush draw'
+BACKDOOR_STRAIGHT = 'backdoor straight draw'
+
+# Five-rank windows as in check_straight, high to low, the wheel last
+_STRAIGHT_WINDOWS = [(0b11111 << (high - 6), high) for high in range(14, 5, -1)]
+_STRAIGHT_WINDOWS.append((0b1000000001111, 5))
+
+def _one_card_table(max_unseen=47):
+    """HIT_NEXT_CARD[unseen][outs]: chance the next card is one of the outs."""
+    return [[outs / unseen if unseen else 0.0 for outs in range(unseen + 1)]
+            for unseen in range(max_unseen + 1)]
+
+def _two_card_table(max_unseen=47):
+    """HIT_TWO_CARDS[unseen][outs]: chance at least one of two cards is an out."""
+    return [[1 - comb(unseen - outs, 2) / comb(unseen, 2) if unseen >= 2 else 0.0
+             for outs in range(unseen + 1)]
+            for unseen in range(max_unseen + 1)]
+
+HIT_NEXT_CARD = _one_card_table()
+HIT_TWO_CARDS = _two_card_table()
+
+@lru_cache(maxsize=None)
+def straight_completions(rank_mask):
+    """Returns a 13-bit mask of the ranks that would give rank_mask a straight,
+    or 0 if it already holds one."""
+    if evaluator.straight_high(rank_mask):
+        return 0
+    completions = 0
+    for window, _ in _STRAIGHT_WINDOWS:
+        missing = window & ~rank_mask
+        if missing & (missing - 1) == 0:  # Exactly one rank missing from the window
+            completions |= missing
+    return completions
+
+def _backdoor_straight(rank_mask, hole_mask):
+    """Returns True if two more ranks could make a straight that uses a hole card."""
+    for window, _ in _STRAIGHT_WINDOWS:
+        held = window & rank_mask
+        if held & hole_mask and bin(held).count('1') >= 3:
+            return True
+    return False
+
+def _rank_mask(codes):
+    """Returns the 13-bit mask of the ranks among card codes."""
+    mask = 0
+    for code in codes:
+        mask |= 1 << (code % 13)
+    return mask
+
+class BoardTexture:
+    """Shape of the community cards, independent of any hole cards."""
+
+    __slots__ = ('paired', 'trips', 'suits', 'flush_possible', 'straight_possible', 'high_rank')
+
+    def __init__(self, board):
+        """Describes a board of card codes."""
+        counts = [0] * 13
+        suit_counts = [0, 0, 0, 0]
+        for code in board:
+            counts[code % 13] += 1
+            suit_counts[code // 13] += 1
+        most_suited = max(suit_counts)
+        self.paired = max(counts) >= 2
+        self.trips = max(counts) >= 3
+        if most_suited == len(board):
+            self.suits = 'monotone'
+        elif most_suited == 1:
+            self.suits = 'rainbow'
+        elif most_suited == 3:
+            self.suits = 'three-flush'  # Three of one suit on the turn
+        else:
+            self.suits = 'two-tone'
+        self.flush_possible = most_suited >= 3
+        rank_mask = _rank_mask(board)
+        self.straight_possible = any(bin(window & rank_mask).count('1') >= 3
+                                     for window, _ in _STRAIGHT_WINDOWS)
+        self.high_rank = max(code % 13 for code in board) + 2
+
+    def __str__(self):
+        """Returns a short description such as 'paired, two-tone, A high'."""
+        parts = ['trips' if self.trips else 'paired' if self.paired else 'unpaired', self.suits]
+        if self.straight_possible:
+            parts.append('straight possible')
+        parts.append(f"{RANK_KEYS[self.high_rank - 2]} high")
+        return ', '.join(parts)
+
+class Analysis:
+    """Draws, outs and improvement odds for hole cards on a flop or turn."""
+
+    __slots__ = ('texture', 'strength', 'category', 'draws', 'outs', 'unseen',
+                 'turn_probability', 'river_probability')
+
+    def __str__(self):
+        """Returns a readable summary of the analysis."""
+        draws = ', '.join(self.draws) or 'no draws'
+        turn = '' if self.turn_probability is None else f"{self.turn_probability:.1%} by the turn, "
+        return (f"Board: {self.texture}; {draws}; {len(self.outs)} outs: "
+                f"{turn}{self.river_probability:.1%} by the river")
+
+def analyze(hole, community_cards):
+    """Analyzes two hole cards on a flop or turn (Card objects or codes, e.g.
+    a player's hand and Game.community_cards).
+
+    Outs are unseen cards that raise the hand's category beyond what the same
+    card gives the board alone. Probabilities count direct outs only, so
+    runner-runner backdoor hits are not included.
+    """
+    hole = to_codes(hole)
+    board = to_codes(community_cards)
+    if len(hole) != 2:
+        raise ValueError("Analysis needs exactly two hole cards.")
+    if len(board) not in (3, 4):
+        raise ValueError("Analysis needs a flop or a turn.")
+    cards = hole + board
+    if len(set(cards)) != len(cards):
+        raise ValueError("The same card appears more than once.")
+
+    result = Analysis()
+    result.texture = BoardTexture(board)
+    hand = evaluator.HandState(cards)
+    board_state = evaluator.HandState(board)
+    result.strength = hand.strength
+    result.category = hand.category
+
+    # Draws
+    draws = []
+    hole_ranks = _rank_mask(hole)
+    rank_mask = _rank_mask(cards)
+    suit_counts = [0, 0, 0, 0]
+    for code in cards:
+        suit_counts[code // 13] += 1
+    hole_suits = {code // 13 for code in hole}
+    made_flush = max(suit_counts) >= 5
+    if not made_flush:
+        if any(suit_counts[suit] == 4 for suit in hole_suits):
+            draws.append(FLUSH_DRAW)
+        elif len(board) == 3 and any(suit_counts[suit] == 3 for suit in hole_suits):
+            draws.append(BACKDOOR_FLUSH)
+    completions = straight_completions(rank_mask) & ~straight_completions(_rank_mask(board))
+    if completions and not made_flush:
+        if completions & (completions - 1) == 0:
+            draws.append(GUTSHOT)
+        elif completions & (completions >> 5):  # Both ends of four in a row, e.g. 5-6-7-8
+            draws.append(OPEN_ENDED)
+        else:
+            draws.append(DOUBLE_GUTSHOT)
+    elif (len(board) == 3 and not evaluator.straight_high(rank_mask)
+          and _backdoor_straight(rank_mask, hole_ranks)):
+        draws.append(BACKDOOR_STRAIGHT)
+    result.draws = draws
+
+    # Outs
+    dead = 0
+    for code in cards:
+        dead |= 1 << code
+    category = hand.category
+    outs = []
+    for code in range(52):
+        if dead & (1 << code):
+            continue
+        improved = hand.copy()
+        improved.add(code)
+        if improved.category > category:
+            board_only = board_state.copy()
+            board_only.add(code)
+            if improved.category > board_only.category:
+                outs.append(code)
+    result.outs = outs
+    result.unseen = 52 - len(cards)
+    if len(board) == 3:
+        result.turn_probability = HIT_NEXT_CARD[result.unseen][len(outs)]
+        result.river_probability = HIT_TWO_CARDS[result.unseen][len(outs)]
+    else:
+        result.turn_probability = None
+        result.river_probability = HIT_NEXT_CARD[result.unseen][len(outs)]
+    return result
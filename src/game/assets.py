@@ -0,0 +1,134 @@
+"""
+Asset manager for the pygame client
+
+The 52 card images are packed into one sprite atlas the first time they are
+needed and the atlas is cached on disk, so later starts read two files
+instead of 52. Card surfaces are sliced out of the atlas lazily, on first
+use, and the table background is scaled once per resolution, with the
+scaled copy cached on disk as well. The caches are rebuilt whenever a source
+image is newer than them.
+"""
+
+import json
+import os
+
+import pygame
+
+from src.constants import ASSET_CACHE_DIR, BACKGROUND_PATH, CARD_IMAGES_DIR, RANK_KEYS, SUIT_KEYS
+
+ATLAS_COLUMNS = len(RANK_KEYS)
+ATLAS_PATH = os.path.join(ASSET_CACHE_DIR, "deck_atlas.png")
+ATLAS_INDEX_PATH = os.path.join(ASSET_CACHE_DIR, "deck_atlas.json")
+
+# The 52 card image keys ('2s' ... 'Ac') in atlas order
+CARD_KEYS = tuple(rank + suit for suit in SUIT_KEYS for rank in RANK_KEYS)
+
+def _card_path(key):
+    """Returns the path of one card's source image."""
+    return os.path.join(CARD_IMAGES_DIR, f"{key}.png")
+
+def _is_fresh(cache_path, sources):
+    """Returns True if cache_path exists and is newer than every source file."""
+    try:
+        built = os.path.getmtime(cache_path)
+    except OSError:
+        return False
+    return all(os.path.getmtime(source) <= built for source in sources)
+
+def build_atlas():
+    """Packs the card images into a grid, saves it with an index of each
+    card's rectangle, and returns (atlas surface, {key: rect tuple})."""
+    images = {key: pygame.image.load(_card_path(key)) for key in CARD_KEYS}
+    cell_width = max(image.get_width() for image in images.values())
+    cell_height = max(image.get_height() for image in images.values())
+    rows = -(-len(images) // ATLAS_COLUMNS)
+    atlas = pygame.Surface((cell_width * ATLAS_COLUMNS, cell_height * rows), pygame.SRCALPHA)
+    rects = {}
+    for number, (key, image) in enumerate(images.items()):
+        x = (number % ATLAS_COLUMNS) * cell_width
+        y = (number // ATLAS_COLUMNS) * cell_height
+        atlas.blit(image, (x, y))
+        rects[key] = (x, y, image.get_width(), image.get_height())
+
+    os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+    pygame.image.save(atlas, ATLAS_PATH)
+    with open(ATLAS_INDEX_PATH, 'w') as file:
+        json.dump(rects, file)
+    return atlas, rects
+
+def load_atlas():
+    """Returns (atlas surface, {key: rect tuple}), building the cached atlas if
+    it is missing or older than any card image."""
+    sources = [_card_path(key) for key in CARD_KEYS]
+    if _is_fresh(ATLAS_PATH, sources) and _is_fresh(ATLAS_INDEX_PATH, sources):
+        with open(ATLAS_INDEX_PATH) as file:
+            rects = json.load(file)
+        return pygame.image.load(ATLAS_PATH), rects
+    return build_atlas()
+
+class CardImages:
+    """Mapping from card keys to card surfaces, sliced from the atlas on first use.
+
+    Nothing is read from disk until the first card is looked up, and the
+    surfaces share the atlas's pixels rather than copying them.
+    """
+
+    def __init__(self):
+        """Creates the mapping without loading anything."""
+        self._atlas = None
+        self._rects = None
+        self._surfaces = {}
+
+    def _load(self):
+        """Loads the atlas and converts it for fast blitting."""
+        atlas, rects = load_atlas()
+        self._atlas = atlas.convert_alpha() if pygame.display.get_surface() is not None else atlas
+        self._rects = rects
+
+    def __getitem__(self, key):
+        """Returns the surface for a key like 'As'; raises KeyError for an unknown key."""
+        surface = self._surfaces.get(key)
+        if surface is None:
+            if self._atlas is None:
+                self._load()
+            surface = self._surfaces[key] = self._atlas.subsurface(self._rects[key])
+        return surface
+
+    def __contains__(self, key):
+        return key in CARD_KEYS
+
+    def __len__(self):
+        return len(CARD_KEYS)
+
+class BackgroundCache:
+    """Table backgrounds scaled to each resolution, kept in memory and on disk."""
+
+    def __init__(self, path=BACKGROUND_PATH):
+        """Creates an empty cache for the background image at path."""
+        self.path = path
+        self._surfaces = {}
+
+    def _cache_path(self, size):
+        """Returns the on-disk cache path for one resolution."""
+        name = os.path.splitext(os.path.basename(self.path))[0]
+        return os.path.join(ASSET_CACHE_DIR, f"{name}_{size[0]}x{size[1]}.png")
+
+    def get(self, size):
+        """Returns the background scaled to size (width, height)."""
+        size = tuple(size)
+        surface = self._surfaces.get(size)
+        if surface is None:
+            cache_path = self._cache_path(size)
+            if _is_fresh(cache_path, [self.path]):
+                surface = pygame.image.load(cache_path)
+            else:
+                surface = pygame.transform.scale(pygame.image.load(self.path), size)
+                os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+                pygame.image.save(surface, cache_path)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            self._surfaces[size] = surface
+        return surface
+
+card_images = CardImages()
+backgrounds = BackgroundCache()
@@ -0,0 +1,43 @@
+"""
+NumPy batch hand evaluator
+
+Scores many hands at once with the same lookup tables as src.game.evaluator,
+so every strength matches evaluator.evaluate (and Game.rank_hand ordering)
+exactly.
+"""
+
+import numpy as np
+
+import src.game.evaluator as evaluator
+
+_PRIMES = np.array(evaluator.RANK_PRIMES, dtype=np.int64)
+_FLUSH_TABLE = np.array(evaluator.FLUSH_TABLE, dtype=np.int64)
+
+# RANK_TABLE as parallel sorted arrays, searched with np.searchsorted
+_RANK_KEYS = np.array(sorted(evaluator.RANK_TABLE), dtype=np.int64)
+_RANK_VALUES = np.array([evaluator.RANK_TABLE[key] for key in _RANK_KEYS.tolist()], dtype=np.int64)
+
+def evaluate_batch(codes):
+    """Returns an (N,) array of strengths for an (N, k) array of card codes,
+    1 <= k <= 7, where each row holds distinct cards."""
+    codes = np.asarray(codes, dtype=np.int64)
+    if codes.ndim != 2 or not 1 <= codes.shape[1] <= 7:
+        raise ValueError(f"Expected an (N, k) array of card codes with k <= 7, got shape {codes.shape}")
+    suits, ranks = np.divmod(codes, 13)
+    bits = np.left_shift(1, ranks)
+
+    # Suited rank masks; cards are distinct, so summing the bits is a bitwise or
+    strengths = np.zeros(len(codes), dtype=np.int64)
+    for suit in range(4):
+        suit_masks = np.where(suits == suit, bits, 0).sum(axis=1)
+        np.maximum(strengths, _FLUSH_TABLE[suit_masks], out=strengths)
+
+    # With at most 7 cards, a flush rules out quads and full houses
+    no_flush = strengths == 0
+    products = _PRIMES[ranks[no_flush]].prod(axis=1)
+    strengths[no_flush] = _RANK_VALUES[np.searchsorted(_RANK_KEYS, products)]
+    return strengths
+
+def categories(strengths):
+    """Returns the hand category (a key of HANDS) of each strength."""
+    return np.right_shift(strengths, evaluator.CATEGORY_SHIFT)
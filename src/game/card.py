@@ -1,18 +1,27 @@
 """
 Contains the Card class
 
+Each card also has a compact integer code, ``suit_index * 13 + (rank - 2)``,
+and a set of cards can be held as a 52-bit mask with bit ``code`` set per card.
+The 52 possible cards are interned in CARDS, so dealing never creates new ones.
 """
 
+from src.constants import RANKS, SUITS, RANK_KEYS, SUIT_KEYS
+
 class Card:
     """ A card object with a suit and rank."""
 
+    __slots__ = ('rank', 'suit', 'code')
+
     def __init__(self, rank, suit):
         """Creates a card with the given rank and suit."""
         self.rank = rank
         self.suit = suit
+        self.code = SUITS.index(suit) * 13 + rank - 2
         
     def get_key(self):
-        return  f"{self.rank}{self.suit}"
+        """Returns the short key of a card, e.g. 'As', matching its image name."""
+        return code_to_key(self.code)
                 
     def __str__(self):
         """Returns the string representation of a card."""
@@ -27,3 +36,41 @@ class Card:
         else:
             rank = self.rank
         return str(rank) + ' of ' + self.suit
+
+# Interned cards, indexed by code
+CARDS = tuple(Card(rank, suit) for suit in SUITS for rank in RANKS)
+
+def code_to_key(code):
+    """Returns the short key ('As', 'Td', ...) of a card code."""
+    suit, rank_index = divmod(code, 13)
+    return RANK_KEYS[rank_index] + SUIT_KEYS[suit]
+
+def key_to_code(key):
+    """Returns the card code of a short key such as 'As' or 'Td'."""
+    if len(key) != 2 or key[0] not in RANK_KEYS or key[1] not in SUIT_KEYS:
+        raise ValueError(f"Invalid card key: {key!r}")
+    return SUIT_KEYS.index(key[1]) * 13 + RANK_KEYS.index(key[0])
+
+def card_from_key(key):
+    """Returns the interned Card for a short key."""
+    return CARDS[key_to_code(key)]
+
+def to_mask(codes):
+    """Returns the 52-bit mask of a collection of card codes."""
+    mask = 0
+    for code in codes:
+        mask |= 1 << code
+    return mask
+
+def cards_to_mask(cards):
+    """Returns the 52-bit mask of a collection of Card objects."""
+    return to_mask(card.code for card in cards)
+
+def mask_to_codes(mask):
+    """Returns the card codes set in a 52-bit mask, in ascending order."""
+    codes = []
+    while mask:
+        low = mask & -mask
+        codes.append(low.bit_length() - 1)
+        mask ^= low
+    return codes
@@ -5,49 +5,71 @@ Contains the Deck class
 
 import random
 
-from src.constants import RANKS, SUITS
-from src.game.card import Card
+from src.game.card import CARDS
 
 class Deck:
-    """ A deck containing 52 cards."""
+    """ A deck containing 52 cards.
 
-    def __init__(self):
-        """Creates a full deck of cards."""
-        self.cards = []
-        for suit in SUITS:
-            for rank in RANKS:
-                c = Card(rank, suit)
-                self.cards.append(c)
+    The cards live in one fixed list for the lifetime of the deck. Dealing
+    advances a cursor into it and shuffling permutes it in place, so no cards
+    are moved or allocated between hands.
+    """
+
+    def __init__(self, rng=None):
+        """Creates a full deck from the interned cards.
+
+        rng may be a random.Random or a numpy.random.Generator to make
+        shuffles reproducible; the global random module is used otherwise.
+        """
+        self.cards = list(CARDS)
+        self.position = 0
+        self.rng = rng if rng is not None else random
+        self._swap_bounds = list(range(len(self.cards), 1, -1))
 
     def __str__(self): 
         """Returns the string representation of a deck."""
         result = ''
-        for c in self.cards:
+        for c in self.cards[self.position:]:
             result += str(c) + '\n'
         return result
 
     def __len__(self):
        """Returns the number of cards left in the deck."""
-       return len(self.cards)
+       return len(self.cards) - self.position
 
     def shuffle(self):
-        """Shuffles the cards."""
-        random.shuffle(self.cards)
+        """Shuffles all 52 cards in place (Fisher-Yates) and resets the cursor."""
+        cards = self.cards
+        if hasattr(self.rng, 'integers'):  # numpy Generator: draw every swap at once
+            swaps = self.rng.integers(0, self._swap_bounds).tolist()
+            for i, j in zip(range(len(cards) - 1, 0, -1), swaps):
+                cards[i], cards[j] = cards[j], cards[i]
+        else:
+            rand = self.rng.random
+            for i in range(len(cards) - 1, 0, -1):
+                j = int(rand() * (i + 1))
+                cards[i], cards[j] = cards[j], cards[i]
+        self.position = 0
+
+    def reset(self):
+        """Returns every dealt card to the deck without reordering it."""
+        self.position = 0
 
     def deal(self):
         """Removes and returns the top card or None 
         if the deck is empty."""
-        if len(self) == 0:
+        if self.position >= len(self.cards):
            return None
-        else:
-           return self.cards.pop(0)
+        card = self.cards[self.position]
+        self.position += 1
+        return card
 
     def peek(self, index):
         """Prints attributes of indexed card or
         an error if the index is invalid."""
         if type(index) == int:
             if index <= len(self) and index > 0:
-                print(self.cards[index-1])
+                print(self.cards[self.position + index - 1])
             else:
                 print("index is out of range")
         else:
@@ -56,7 +78,7 @@ class Deck:
     def highestCard(self, c):
         """Function returns True if top card is higher
         rank than c, False otherwise."""
-        topcard = self.cards[0]
+        topcard = self.cards[self.position]
         if topcard.rank > c.rank:
             return True
         elif topcard.rank == c.rank:
@@ -0,0 +1,366 @@
+"""
+Headless game engine
+
+Plays hands of Texas Hold'em as an explicit state machine driven by agent
+callables. Nothing here imports pygame or calls input(), so hands can be
+played in bulk on machines without a display or a human.
+"""
+
+from src.game.deck import Deck
+import src.game.evaluator as evaluator
+from src.game.player import Player
+from src.game.pot import award_pots, build_pots
+from src.game.snapshot import restore_snapshot, take_snapshot
+
+# Hand phases, in the order a hand moves through them
+BLINDS = 'blinds'
+PREFLOP = 'preflop'
+FLOP = 'flop'
+TURN = 'turn'
+RIVER = 'river'
+SHOWDOWN = 'showdown'
+PHASES = (BLINDS, PREFLOP, FLOP, TURN, RIVER, SHOWDOWN)
+
+# Player actions, named as in Game.betting_round
+ACTIONS = ('fold', 'check', 'call', 'bet', 'all-in')
+
+# Forced bets and the seat number of community cards, as logged in hand histories
+ANTE, SMALL_BLIND, BIG_BLIND = range(3)
+BOARD_SEAT = 255
+
+_NEXT_PHASE = {PREFLOP: FLOP, FLOP: TURN, TURN: RIVER, RIVER: SHOWDOWN}
+
+class Decision:
+    """What the acting player can see when their agent is asked to act."""
+
+    __slots__ = ('seat', 'phase', 'hand', 'community_cards', 'pot', 'chips', 'current_bet',
+                 'current_highest_bet', 'to_call', 'min_bet', 'legal_actions', 'small_blind_seat')
+
+    def __init__(self, game, seat):
+        """Captures the acting player's view of a HeadlessGame."""
+        player = game.players[seat]
+        self.seat = seat
+        self.phase = game.phase
+        self.hand = player.hand
+        self.community_cards = game.community_cards
+        self.pot = game.pot
+        self.chips = player.chips
+        self.current_bet = player.current_bet
+        self.current_highest_bet = game.current_highest_bet
+        self.to_call = max(game.current_highest_bet - player.current_bet, 0)
+        self.min_bet = game.min_bet()
+        self.legal_actions = game.legal_actions(seat)
+        self.small_blind_seat = game.small_blind_seat
+
+class HeadlessGame:
+    """A poker table whose hands are played by agents instead of a GUI.
+
+    Each agent is a callable taking a Decision and returning an action name
+    from ACTIONS, or an (action, amount) tuple for 'bet'. Hands can also be
+    driven one action at a time with start_hand() and act().
+    """
+
+    def __init__(self, players, agents=None, small_blind_amount=10, big_blind_amount=20,
+                 ante_amount=0, rng=None, recorder=None):
+        """Creates a table from Player objects or starting chip counts.
+        recorder, if given, is a history.HandRecorder that logs every hand."""
+        self.players = [p if isinstance(p, Player) else Player(i + 1, p) for i, p in enumerate(players)]
+        if len(self.players) < 2:
+            raise ValueError("A game needs at least two players.")
+        self.agents = agents
+        self.recorder = recorder
+        self.deck = Deck(rng)
+        self.small_blind_amount = small_blind_amount
+        self.big_blind_amount = big_blind_amount
+        self.ante_amount = ante_amount
+        self.small_blind_index = 0
+        self.hands_played = 0
+
+        self.phase = SHOWDOWN
+        self.community_cards = []
+        self.pot = 0
+        self.current_highest_bet = 0
+        self.contributions = [0] * len(self.players)
+        self.starting_chips = [p.chips for p in self.players]
+        self.payouts = [0] * len(self.players)
+        self.winners = []
+        self.winning_strength = 0
+        self.side_pots = []  # Main pot first, as built at the last showdown
+        self.to_act = []
+        self.small_blind_seat = 0
+        self.big_blind_seat = 0
+
+    # Hand setup
+
+    def start_hand(self):
+        """Shuffles, posts blinds and antes, deals hole cards and opens preflop betting."""
+        seated = [i for i, p in enumerate(self.players) if p.chips > 0]
+        if len(seated) < 2:
+            raise ValueError("At least two players with chips are needed to start a hand.")
+
+        self.phase = BLINDS
+        self.deck.shuffle()
+        self.community_cards = []
+        self.pot = 0
+        self.current_highest_bet = 0
+        self.contributions = [0] * len(self.players)
+        self.starting_chips = [p.chips for p in self.players]
+        self.payouts = [0] * len(self.players)
+        self.winners = []
+        self.winning_strength = 0  # Stays 0 when everyone else folds
+        self.side_pots = []
+        for player in self.players:
+            player.hand = []
+            player.current_bet = 0
+            player.is_active = player.chips > 0
+
+        self.post_blinds_and_antes()
+        self.deal_cards()
+        self.phase = PREFLOP
+        if self.recorder is not None:
+            self.recorder.set_phase(PREFLOP)
+        first = self._next_seat(self.big_blind_seat)
+        self.to_act = self._betting_order(first)
+        self._advance()
+
+    def post_blinds_and_antes(self):
+        """Collects antes as dead money and posts the blinds, then rotates them."""
+        n = len(self.players)
+        self.small_blind_seat = self._next_seat(self.small_blind_index - 1)
+        self.big_blind_seat = self._next_seat(self.small_blind_seat)
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.start_hand(self.hands_played, n, self.small_blind_seat)
+
+        if self.ante_amount:
+            for seat, player in enumerate(self.players):
+                if player.is_active:
+                    paid = min(self.ante_amount, player.chips)
+                    player.chips -= paid
+                    self._collect(seat, paid)
+                    if recorder is not None:
+                        recorder.blind(seat, ANTE, paid)
+
+        for blind, seat, amount in ((SMALL_BLIND, self.small_blind_seat, self.small_blind_amount),
+                                    (BIG_BLIND, self.big_blind_seat, self.big_blind_amount)):
+            player = self.players[seat]
+            paid = player.bet(amount, 0)
+            self._collect(seat, paid)
+            if recorder is not None:
+                recorder.blind(seat, blind, paid)
+            self.current_highest_bet = max(self.current_highest_bet, player.current_bet)
+        self.small_blind_index = (self.small_blind_seat + 1) % n
+
+    def deal_cards(self):
+        """Deals two cards to each player in the hand."""
+        for _ in range(2):
+            for seat, player in enumerate(self.players):
+                if player.is_active:
+                    card = self.deck.deal()
+                    player.add_card(card)
+                    if self.recorder is not None:
+                        self.recorder.deal(seat, card)
+
+    def deal_flop(self):
+        """Deals the flop after burning a card."""
+        self.deck.deal()  # Burn a card
+        for _ in range(3):
+            self._deal_board_card()
+
+    def deal_turn_or_river(self):
+        """Deals the turn or the river after burning a card."""
+        self.deck.deal()  # Burn a card
+        self._deal_board_card()
+
+    def _deal_board_card(self):
+        """Deals one community card."""
+        card = self.deck.deal()
+        self.community_cards.append(card)
+        if self.recorder is not None:
+            self.recorder.deal(BOARD_SEAT, card)
+
+    # Betting
+
+    @property
+    def current_seat(self):
+        """The seat whose turn it is, or None when nobody needs to act."""
+        return self.to_act[0] if self.to_act else None
+
+    def is_hand_over(self):
+        """Returns True once the current hand has been paid out."""
+        return self.phase == SHOWDOWN
+
+    def min_bet(self):
+        """Smallest bet or raise amount Player.bet accepts (the big blind when unopened)."""
+        return 2 * self.current_highest_bet if self.current_highest_bet > 0 else self.big_blind_amount
+
+    def legal_actions(self, seat):
+        """Returns the actions the player in seat may take right now."""
+        player = self.players[seat]
+        if player.current_bet < self.current_highest_bet:
+            actions = ['fold', 'call']
+        else:
+            actions = ['fold', 'check']
+        if player.chips > self.current_highest_bet - player.current_bet:
+            actions.append('bet')
+        if player.chips > 0:
+            actions.append('all-in')
+        return actions
+
+    def decision(self):
+        """Returns the Decision for the player whose turn it is."""
+        return Decision(self, self.current_seat)
+
+    def act(self, action, amount=0):
+        """Applies an action for the current player and advances the hand.
+
+        Raises ValueError for an action the betting rules do not allow, in
+        which case the game state is left unchanged.
+        """
+        seat = self.current_seat
+        if seat is None:
+            raise ValueError("No player is due to act.")
+        player = self.players[seat]
+        previous_highest = self.current_highest_bet
+        previous_contribution = self.contributions[seat]
+
+        if action == 'fold':
+            player.fold()
+        elif action == 'check':
+            player.check(self.current_highest_bet)
+        elif action == 'call':
+            if player.current_bet >= self.current_highest_bet:
+                raise ValueError("Nothing to call; check instead.")
+            self._collect(seat, player.call(self.current_highest_bet))
+        elif action == 'bet':
+            self._collect(seat, player.bet(amount, self.current_highest_bet))
+        elif action == 'all-in':
+            self._collect(seat, player.all_in())
+        else:
+            raise ValueError(f"Unknown action: {action!r}")
+
+        if self.recorder is not None:
+            self.recorder.action(seat, action, self.contributions[seat] - previous_contribution)
+
+        self.current_highest_bet = max(self.current_highest_bet, player.current_bet)
+        if self.current_highest_bet > previous_highest:
+            # A bet or raise reopens the action for everyone else
+            self.to_act = [s for s in self._betting_order(self._next_seat(seat)) if s != seat]
+        else:
+            self.to_act.pop(0)
+        self._advance()
+
+    def play_hand(self, agents=None):
+        """Plays one full hand with the given (or the table's) agents and
+        returns each seat's net chip result."""
+        agents = agents if agents is not None else self.agents
+        self.start_hand()
+        while not self.is_hand_over():
+            choice = agents[self.current_seat](self.decision())
+            if isinstance(choice, str):
+                self.act(choice)
+            else:
+                self.act(*choice)
+        return self.net_results()
+
+    def net_results(self):
+        """Returns each seat's chip change over the current or last hand."""
+        return [p.chips - start for p, start in zip(self.players, self.starting_chips)]
+
+    def snapshot(self, include_rng=False):
+        """Returns a compact GameSnapshot of the current state (see src.game.snapshot)."""
+        return take_snapshot(self, include_rng)
+
+    def restore(self, snap):
+        """Restores a state returned by snapshot()."""
+        restore_snapshot(self, snap)
+
+    # Internals
+
+    def _collect(self, seat, amount):
+        """Moves chips a player has committed into the pot."""
+        self.pot += amount
+        self.contributions[seat] += amount
+
+    def _next_seat(self, seat):
+        """Returns the next seat after seat (wrapping) that is still in the hand."""
+        n = len(self.players)
+        for offset in range(1, n + 1):
+            candidate = (seat + offset) % n
+            if self.players[candidate].is_active:
+                return candidate
+        return seat
+
+    def _betting_order(self, first):
+        """Returns the seats that can still bet, in acting order from first."""
+        n = len(self.players)
+        order = [(first + i) % n for i in range(n)]
+        return [s for s in order if self.players[s].is_active and self.players[s].chips > 0]
+
+    def _advance(self):
+        """Ends the hand or moves to the next street when betting is closed."""
+        while True:
+            live = [s for s, p in enumerate(self.players) if p.is_active]
+            if len(live) == 1:
+                self._pay({live[0]: self.pot}, live)
+                return
+            # Nobody can bet against a lone player who has already matched
+            if len(self.to_act) == 1 and len(self._betting_order(0)) == 1:
+                player = self.players[self.to_act[0]]
+                if player.current_bet >= self.current_highest_bet:
+                    self.to_act = []
+            if self.to_act:
+                return
+            self._next_street()
+            if self.phase == SHOWDOWN:
+                self.showdown()
+                return
+
+    def _next_street(self):
+        """Closes the betting round and deals the next street."""
+        for player in self.players:
+            player.current_bet = 0
+        self.current_highest_bet = 0
+        self.phase = _NEXT_PHASE[self.phase]
+        if self.recorder is not None:
+            self.recorder.set_phase(self.phase)
+        if self.phase == FLOP:
+            self.deal_flop()
+        elif self.phase in (TURN, RIVER):
+            self.deal_turn_or_river()
+        if self.phase != SHOWDOWN and len(self._betting_order(0)) > 1:
+            # Heads-up the big blind acts first after the flop, otherwise the small blind
+            heads_up = sum(p.is_active for p in self.players) == 2
+            first = self.big_blind_seat if heads_up else self.small_blind_seat
+            if not self.players[first].is_active:
+                first = self._next_seat(first)
+            self.to_act = self._betting_order(first)
+        else:
+            self.to_act = []
+
+    def showdown(self):
+        """Ranks each remaining hand once and pays the main and side pots."""
+        self.phase = SHOWDOWN
+        live = [s for s, p in enumerate(self.players) if p.is_active]
+        board = [card.code for card in self.community_cards]
+        holes = [[card.code for card in self.players[s].hand] for s in live]
+        strengths = dict(zip(live, evaluator.evaluate_shared(holes, board)))
+        self.winning_strength = max(strengths.values())
+        self.side_pots = build_pots(self.contributions, [p.is_active for p in self.players])
+        payouts, winners = award_pots(self.side_pots, strengths, self.small_blind_seat, len(self.players))
+        self._pay(payouts, winners[0])
+
+    def _pay(self, payouts, winners):
+        """Hands out the pot and ends the hand; winners are the main pot's."""
+        self.phase = SHOWDOWN
+        self.to_act = []
+        for seat, won in payouts.items():
+            self.players[seat].chips += won
+            self.payouts[seat] += won
+        self.winners = winners
+        self.pot = 0
+        self.hands_played += 1
+        if self.recorder is not None:
+            for seat, net in enumerate(self.net_results()):
+                self.recorder.result(seat, net)
+            self.recorder.end_hand()
@@ -0,0 +1,145 @@
+"""
+Equity calculation for known hole cards
+
+Works directly on card codes and the lookup-table evaluator, so no Game,
+Player or pygame screen is needed to answer an equity query.
+"""
+
+from itertools import combinations
+import math
+import random
+from statistics import NormalDist
+
+from src.game.card import to_mask
+import src.game.evaluator as evaluator
+
+# Largest number of hand evaluations (boards x players) enumerated exactly;
+# about 20-30ms with the lookup-table evaluator
+EXACT_EVALUATION_LIMIT = 20000
+
+class EquityResult:
+    """Win, tie and equity estimates for each player of an equity query."""
+
+    def __init__(self, wins, ties, shares, share_squares, samples, confidence, exact=False,
+                 standard_errors=None):
+        """Builds the estimates from per-player sample totals.
+
+        standard_errors, if given, replaces the standard error of each equity
+        that would otherwise be computed from share_squares as if every
+        sample were independent.
+        """
+        self.samples = samples
+        self.confidence = confidence
+        self.exact = exact
+        self.win = [w / samples for w in wins]
+        self.tie = [t / samples for t in ties]
+        self.equity = [s / samples for s in shares]
+        z = 0.0 if exact else NormalDist().inv_cdf((1 + confidence) / 2)
+        self.intervals = []
+        for i, (mean, square) in enumerate(zip(self.equity, share_squares)):
+            if standard_errors is not None:
+                half_width = z * standard_errors[i]
+            else:
+                variance = max(square / samples - mean * mean, 0.0)
+                half_width = z * math.sqrt(variance / samples)
+            self.intervals.append((max(mean - half_width, 0.0), min(mean + half_width, 1.0)))
+
+    def half_width(self):
+        """Returns the widest confidence half-width across players."""
+        return max((high - low) / 2 for low, high in self.intervals)
+
+    def __str__(self):
+        """Returns a per-player summary of the estimates."""
+        lines = []
+        for i, (low, high) in enumerate(self.intervals):
+            lines.append(f"Player {i + 1}: equity {self.equity[i]:.4f} [{low:.4f}, {high:.4f}], "
+                         f"win {self.win[i]:.4f}, tie {self.tie[i]:.4f}")
+        kind = "exact" if self.exact else f"{self.confidence:.0%} CI"
+        lines.append(f"({self.samples} boards, {kind})")
+        return '\n'.join(lines)
+
+def to_codes(cards):
+    """Converts Card objects (or codes, which pass through) to card codes."""
+    return [card if isinstance(card, int) else card.code for card in cards]
+
+def _prepare(hands, board):
+    """Validates a query and returns (hands, board, live codes) as codes."""
+    hands = [to_codes(hand) for hand in hands]
+    board = to_codes(board)
+    if not hands:
+        raise ValueError("At least one hand is required.")
+    if any(len(hand) != 2 for hand in hands):
+        raise ValueError("Each hand must have exactly two cards.")
+    if len(board) > 5:
+        raise ValueError("The board cannot have more than five cards.")
+    known = [code for hand in hands for code in hand] + board
+    if len(set(known)) != len(known):
+        raise ValueError("The same card appears more than once.")
+    dead = to_mask(known)
+    live = [code for code in range(52) if not dead & (1 << code)]
+    return hands, board, live
+
+def _score_board(hands, board, wins, ties, shares, share_squares):
+    """Scores one complete board for every player and accumulates the results."""
+    scores = evaluator.evaluate_shared(hands, board)
+    best = max(scores)
+    winners = [i for i, score in enumerate(scores) if score == best]
+    share = 1 / len(winners)
+    for i in winners:
+        if len(winners) == 1:
+            wins[i] += 1
+        else:
+            ties[i] += 1
+        shares[i] += share
+        share_squares[i] += share * share
+
+def monte_carlo_equity(hands, board=(), precision=0.005, confidence=0.95,
+                       min_samples=1000, max_samples=1000000, batch_size=1000, rng=None):
+    """Estimates each hand's equity by sampling the rest of the board.
+
+    hands is a list of two-card hands and board the known community cards
+    (Card objects or codes, e.g. Game.community_cards). Sampling stops once
+    every player's equity confidence interval is within +/- precision, or
+    after max_samples boards.
+    """
+    hands, board, live = _prepare(hands, board)
+    rng = rng if rng is not None else random.Random()
+    needed = 5 - len(board)
+    players = len(hands)
+    wins, ties = [0] * players, [0] * players
+    shares, share_squares = [0.0] * players, [0.0] * players
+
+    samples = 0
+    while samples < max_samples:
+        for _ in range(min(batch_size, max_samples - samples)):
+            _score_board(hands, board + rng.sample(live, needed), wins, ties, shares, share_squares)
+            samples += 1
+        result = EquityResult(wins, ties, shares, share_squares, samples, confidence)
+        if samples >= min_samples and result.half_width() <= precision:
+            break
+    return result
+
+def exact_equity(hands, board=()):
+    """Computes each hand's exact equity over every possible rest of the board."""
+    hands, board, live = _prepare(hands, board)
+    players = len(hands)
+    wins, ties = [0] * players, [0] * players
+    shares, share_squares = [0.0] * players, [0.0] * players
+
+    samples = 0
+    for runout in combinations(live, 5 - len(board)):
+        _score_board(hands, board + list(runout), wins, ties, shares, share_squares)
+        samples += 1
+    return EquityResult(wins, ties, shares, share_squares, samples, 1.0, exact=True)
+
+def count_boards(hands, board=()):
+    """Returns the number of distinct ways to complete the board."""
+    known = 2 * len(hands) + len(board)
+    return math.comb(52 - known, 5 - len(board))
+
+def equity(hands, board=(), exact_limit=EXACT_EVALUATION_LIMIT, **sampling_options):
+    """Computes equity exactly when the board space is small enough, and by
+    Monte Carlo sampling (see monte_carlo_equity) otherwise."""
+    if count_boards(hands, board) * len(hands) <= exact_limit:
+        return exact_equity(hands, board)
+    return monte_carlo_equity(hands, board, **sampling_options)
@@ -0,0 +1,294 @@
+"""
+Lookup-table hand evaluator
+
+Cards are given as their integer codes (see src.game.card) so that a hand can
+be scored with a handful of table lookups instead of sorting and counting.
+The strength returned is a single integer which orders hands the same way as
+the ``(category, kickers)`` tuples produced by ``Game.rank_hand``.
+"""
+
+# One prime per rank, so the product of a hand's primes identifies its ranks
+RANK_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Strength layout: category in the high bits, five 4-bit kickers below it
+KICKER_BITS = 4
+CATEGORY_SHIFT = 5 * KICKER_BITS
+
+_STRAIGHT_MASKS = [(0b11111 << (high - 6), high) for high in range(14, 5, -1)]
+_STRAIGHT_MASKS.append((0b1000000001111, 5))  # Wheel: A-2-3-4-5
+
+# Per-code lookups so the hot loop avoids divmod and shifting
+_CODE_SUIT = [code // 13 for code in range(52)]
+_CODE_BIT = [1 << (code % 13) for code in range(52)]
+_CODE_PRIME = [RANK_PRIMES[code % 13] for code in range(52)]
+
+
+def pack(category, kickers):
+    """Packs a hand category and its kickers into a comparable integer."""
+    strength = category
+    for i in range(5):
+        strength <<= KICKER_BITS
+        if i < len(kickers):
+            strength |= kickers[i]
+    return strength
+
+
+def describe(strength):
+    """Unpacks a strength into the (category, kickers) form used by print_hand_info."""
+    category = strength >> CATEGORY_SHIFT
+    kickers = []
+    for shift in range(CATEGORY_SHIFT - KICKER_BITS, -1, -KICKER_BITS):
+        kicker = (strength >> shift) & 0xF
+        if kicker:
+            kickers.append(kicker)
+    return category, kickers
+
+
+def category(strength):
+    """Returns the hand category (a key of HANDS) of a strength."""
+    return strength >> CATEGORY_SHIFT
+
+
+def straight_high(rank_mask):
+    """Returns the high card of the best straight in a 13-bit rank mask, or 0."""
+    for straight_mask, high in _STRAIGHT_MASKS:
+        if rank_mask & straight_mask == straight_mask:
+            return high
+    return 0
+
+
+def _top_ranks(rank_mask, n):
+    """Returns the n highest ranks set in a 13-bit rank mask."""
+    ranks = []
+    for rank in range(14, 1, -1):
+        if rank_mask & (1 << (rank - 2)):
+            ranks.append(rank)
+            if len(ranks) == n:
+                break
+    return ranks
+
+
+def _flush_strength(rank_mask):
+    """Scores the suited ranks of a flush, detecting straight and royal flushes."""
+    high = straight_high(rank_mask)
+    if high == 14:
+        return pack(10, [14])
+    if high:
+        return pack(9, [high])
+    return pack(6, _top_ranks(rank_mask, 5))
+
+
+def _rank_strength(groups):
+    """Scores a multiset of ranks (no flush possible) given as (rank, count)
+    pairs in descending rank order."""
+    by_rank = [rank for rank, _ in groups]
+    groups = sorted(groups, key=lambda item: item[1], reverse=True)
+    top_rank, top_count = groups[0]
+
+    if top_count == 4:
+        kickers = [rank for rank in by_rank if rank != top_rank][:1]
+        return pack(8, [top_rank] + kickers)
+
+    if top_count == 3 and len(groups) > 1 and groups[1][1] >= 2:
+        return pack(7, [top_rank, groups[1][0]])
+
+    rank_mask = 0
+    for rank in by_rank:
+        rank_mask |= 1 << (rank - 2)
+    high = straight_high(rank_mask) if len(by_rank) >= 5 else 0
+    if high:
+        return pack(5, [high])
+
+    if top_count == 3:
+        kickers = [rank for rank in by_rank if rank != top_rank][:2]
+        return pack(4, [top_rank] + kickers)
+
+    if top_count == 2:
+        pairs = [rank for rank, count in groups if count == 2]
+        if len(pairs) > 1:
+            high_pair, low_pair = pairs[0], pairs[1]
+            kickers = [rank for rank in by_rank if rank not in (high_pair, low_pair)][:1]
+            return pack(3, [high_pair, low_pair] + kickers)
+        kickers = [rank for rank in by_rank if rank != top_rank][:3]
+        return pack(2, [top_rank] + kickers)
+
+    return pack(1, by_rank[:5])
+
+
+def _build_flush_table():
+    """Maps every 13-bit suited rank mask with 5+ bits to its flush strength."""
+    table = [0] * (1 << 13)
+    for rank_mask in range(1 << 13):
+        if bin(rank_mask).count('1') >= 5:
+            table[rank_mask] = _flush_strength(rank_mask)
+    return table
+
+
+def _rank_multisets(rank, remaining, groups, product):
+    """Yields every rank multiset of at most `remaining` further cards, using
+    ranks up to `rank`, as (groups, prime product) pairs."""
+    if groups:
+        yield groups, product
+    if rank < 2 or remaining == 0:
+        return
+    for lower in range(rank, 1, -1):
+        prime = RANK_PRIMES[lower - 2]
+        for count in range(1, min(4, remaining) + 1):
+            yield from _rank_multisets(lower - 1, remaining - count,
+                                       groups + [(lower, count)], product * prime ** count)
+
+
+def _build_rank_table():
+    """Maps the prime product of every 1-7 card rank multiset to its strength."""
+    table = {}
+    for groups, product in _rank_multisets(14, 7, [], 1):
+        table[product] = _rank_strength(groups)
+    return table
+
+
+def _build_product_table():
+    """Maps every 13-bit rank mask to the product of its ranks' primes."""
+    table = [1] * (1 << 13)
+    for rank_mask in range(1, 1 << 13):
+        low = rank_mask & -rank_mask
+        table[rank_mask] = table[rank_mask ^ low] * RANK_PRIMES[low.bit_length() - 1]
+    return table
+
+
+FLUSH_TABLE = _build_flush_table()
+RANK_TABLE = _build_rank_table()
+PRODUCT_TABLE = _build_product_table()
+
+
+def evaluate(codes):
+    """Returns the strength of the best hand made from up to 7 card codes."""
+    suit_masks = [0, 0, 0, 0]
+    product = 1
+    for code in codes:
+        suit_masks[_CODE_SUIT[code]] |= _CODE_BIT[code]
+        product *= _CODE_PRIME[code]
+    # With at most 7 cards, a flush rules out quads and full houses
+    for rank_mask in suit_masks:
+        strength = FLUSH_TABLE[rank_mask]
+        if strength:
+            return strength
+    return RANK_TABLE[product]
+
+
+def evaluate_shared(holes, board):
+    """Returns the strength of each hand of hole-card codes on the same board.
+
+    The board's rank product and suits are computed once and shared by every
+    hand; only a suit with 3+ board cards can make a flush with two hole cards.
+    """
+    board_suits = [0, 0, 0, 0]
+    suit_counts = [0, 0, 0, 0]
+    product = 1
+    for code in board:
+        suit = _CODE_SUIT[code]
+        board_suits[suit] |= _CODE_BIT[code]
+        suit_counts[suit] += 1
+        product *= _CODE_PRIME[code]
+    flush_suit = -1
+    for suit in range(4):
+        if suit_counts[suit] >= 3:
+            flush_suit = suit
+
+    strengths = []
+    for first, second in holes:
+        strength = 0
+        if flush_suit >= 0:
+            suited = board_suits[flush_suit]
+            if _CODE_SUIT[first] == flush_suit:
+                suited |= _CODE_BIT[first]
+            if _CODE_SUIT[second] == flush_suit:
+                suited |= _CODE_BIT[second]
+            strength = FLUSH_TABLE[suited]
+        if not strength:
+            strength = RANK_TABLE[product * _CODE_PRIME[first] * _CODE_PRIME[second]]
+        strengths.append(strength)
+    return strengths
+
+
+def evaluate_mask(mask):
+    """Returns the strength of the best hand in a 52-bit mask of up to 7 cards."""
+    spades = mask & 0x1FFF
+    diamonds = (mask >> 13) & 0x1FFF
+    hearts = (mask >> 26) & 0x1FFF
+    clubs = mask >> 39
+    strength = (FLUSH_TABLE[spades] or FLUSH_TABLE[diamonds]
+                or FLUSH_TABLE[hearts] or FLUSH_TABLE[clubs])
+    if strength:
+        return strength
+    return RANK_TABLE[PRODUCT_TABLE[spades] * PRODUCT_TABLE[diamonds]
+                      * PRODUCT_TABLE[hearts] * PRODUCT_TABLE[clubs]]
+
+
+def evaluate_cards(cards):
+    """Returns the strength of the best hand made from up to 7 Card objects."""
+    return evaluate([card.code for card in cards])
+
+
+class HandState:
+    """A hand built up one card at a time, with its strength kept current.
+
+    Holds rank and suit counts, per-suit rank masks, the 52-bit card mask and
+    the rank prime product, so that adding a card and reading the best hand
+    so far are both O(1). Only the added card's suit can complete a flush,
+    and with at most 7 cards a flush beats anything the ranks alone make.
+    """
+
+    __slots__ = ('rank_counts', 'suit_counts', 'suit_masks', 'mask', 'product', 'flush_suit',
+                 'size', 'strength')
+
+    def __init__(self, codes=()):
+        """Creates a state holding the given card codes (at most 7)."""
+        self.rank_counts = [0] * 13
+        self.suit_counts = [0, 0, 0, 0]
+        self.suit_masks = [0, 0, 0, 0]
+        self.mask = 0
+        self.product = 1
+        self.flush_suit = -1
+        self.size = 0
+        self.strength = 0
+        for code in codes:
+            self.add(code)
+
+    def add(self, code):
+        """Adds one card code and returns the new strength."""
+        suit = _CODE_SUIT[code]
+        self.rank_counts[code % 13] += 1
+        self.suit_counts[suit] += 1
+        self.suit_masks[suit] |= _CODE_BIT[code]
+        self.mask |= 1 << code
+        self.product *= _CODE_PRIME[code]
+        self.size += 1
+        if self.suit_counts[suit] >= 5:
+            self.flush_suit = suit
+        if self.flush_suit >= 0:
+            self.strength = FLUSH_TABLE[self.suit_masks[self.flush_suit]]
+        else:
+            self.strength = RANK_TABLE[self.product]
+        return self.strength
+
+    def add_card(self, card):
+        """Adds one Card object and returns the new strength."""
+        return self.add(card.code)
+
+    @property
+    def category(self):
+        """Returns the category (a key of HANDS) of the best hand so far, or 0 if empty."""
+        return self.strength >> CATEGORY_SHIFT
+
+    def copy(self):
+        """Returns an independent copy, e.g. to branch one board state per player."""
+        other = HandState.__new__(HandState)
+        other.rank_counts = self.rank_counts[:]
+        other.suit_counts = self.suit_counts[:]
+        other.suit_masks = self.suit_masks[:]
+        other.mask = self.mask
+        other.product = self.product
+        other.flush_suit = self.flush_suit
+        other.size = self.size
+        other.strength = self.strength
+        return other
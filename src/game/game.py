@@ -1,86 +1,99 @@
 from src.game.deck import Deck
+from src.game.engine import ACTIONS, ANTE, BIG_BLIND, SMALL_BLIND
+import src.game.evaluator as evaluator
+from src.game.history import BOARD, phase_of
+from src.game.instrumentation import phase_timer
+from src.game.pot import award_pots, build_pots
+from src.game.snapshot import restore_snapshot, take_snapshot
 from src.game.utilities import print_hand_info
 
-from collections import Counter
-
 class Game:
     """Game class for managing poker rounds."""
     
-    def __init__(self, players, small_blind_amount=10, big_blind_amount=20, ante_amount=0):
-        """Initializes a Game object."""
-        self.deck = Deck()
+    def __init__(self, players, small_blind_amount=10, big_blind_amount=20, ante_amount=0, rng=None,
+                 recorder=None, instruments=None, rank_cache=None):
+        """Initializes a Game object. rng seeds the deck's shuffles (see Deck),
+        recorder, if given, is a history.HandRecorder that logs every hand and
+        instruments, if given, is an instrumentation.Instruments that times
+        each phase of play_round. rank_cache, if given, is a
+        rank_cache.RankingCache that rank_hand looks hands up in first."""
+        self.deck = Deck(rng)
+        self.recorder = recorder
+        self.instruments = instruments
+        self.rank_cache = rank_cache
+        self.hands_played = 0
         self.players = players
         self.community_cards = []
         self.pot = 0
         self.side_pots = []
+        self.contributions = [0] * len(players)  # Chips each player has put in this hand
         self.current_highest_bet = 0
         self.small_blind_amount = small_blind_amount
         self.big_blind_amount = big_blind_amount
         self.ante_amount = ante_amount
         self.small_blind_index = 0
+        self.hand_states = [evaluator.HandState() for _ in players]  # Hole cards plus board so far
         
     def handle_bets(self, player, amount):
-        """Handles bet logic including side pot creation for all-in situations."""
+        """Handles bet logic; all-in chips are split into side pots at showdown."""
         if amount >= player.chips:
-            self.create_side_pot(player, amount)
+            self._collect(player, player.all_in())
         else:
-            self.pot += player.bet(amount)
+            self._collect(player, player.bet(amount, self.current_highest_bet))
             self.current_highest_bet = max(self.current_highest_bet, amount)
-    
-    def create_side_pot(self, player, amount):
-        """Create or update side pots when a player goes all-in."""
-        all_in_amount = player.all_in()
-        self.pot += all_in_amount  # Add the all-in amount to the main pot first
 
-        for sp in self.side_pots:
-            if sp['max_contribution'] > player.chips:
-                sp['amount'] += player.chips
-            else:
-                sp['amount'] += sp['max_contribution']
+    def _collect(self, player, amount):
+        """Adds chips a player has committed to the pot and their contribution."""
+        self.pot += amount
+        self.contributions[self.players.index(player)] += amount
 
-        # Check if a new side pot needs to be created
-        existing_contributions = sum(sp['max_contribution'] for sp in self.side_pots if player.chips >= sp['max_contribution'])
-        if player.chips > existing_contributions:
-            new_side_pot = {
-                'amount': player.chips - existing_contributions,
-                'players': [p for p in self.players if p.chips > existing_contributions and p.is_active],
-                'max_contribution': player.chips
-            }
-            self.side_pots.append(new_side_pot)
+    def _record_blind(self, player, blind, amount):
+        """Logs an ante or blind if hands are being recorded."""
+        if self.recorder is not None:
+            self.recorder.blind(self.players.index(player), blind, amount)
 
-    def evaluate_winner(self):
-        # Evaluation logic should now handle side pots
-        base_pot_winner = None  # This will be your normal pot evaluation logic
-        print(f"The winner for the main pot is {base_pot_winner}")
+    def _deal_board_card(self):
+        """Deals one community card, logging it if hands are being recorded."""
+        card = self.deck.deal()
+        self.community_cards.append(card)
+        for state in self.hand_states:
+            state.add(card.code)
+        if self.recorder is not None:
+            self.recorder.deal(BOARD, card)
 
-        for sp in self.side_pots:
-            side_pot_winner = None  # This will involve similar logic to your base pot but restricted to the players in 'sp['players']'
-            print(f"The winner for the side pot of {sp['amount']} is {side_pot_winner}")
-    
     def post_blinds_and_antes(self):
         """Post antes if any and handle blinds rotation among players."""
-        ante_amount = 10
-        small_blind_amount = 20
-        big_blind_amount = 40
+        ante_amount = self.ante_amount
+        small_blind_amount = self.small_blind_amount
+        big_blind_amount = self.big_blind_amount
+        num_players = len(self.players)
+        if self.recorder is not None:
+            self.recorder.start_hand(self.hands_played, num_players, self.small_blind_index % num_players)
 
         # Collect antes if applicable
-        for player in self.players:
-            if player.chips > ante_amount:
-                # If antes are treated as separate from the normal betting cycle, we might not need current_highest_bet
-                self.pot += player.bet(ante_amount, 0)  # Assuming ante doesn't require matching previous bets
-            else:
-                self.pot += player.all_in()
+        if ante_amount:
+            for player in self.players:
+                if player.chips > ante_amount:
+                    # If antes are treated as separate from the normal betting cycle, we might not need current_highest_bet
+                    paid = player.bet(ante_amount, 0)  # Assuming ante doesn't require matching previous bets
+                else:
+                    paid = player.all_in()
+                self._collect(player, paid)
+                self._record_blind(player, ANTE, paid)
 
         # Handle blinds
-        num_players = len(self.players)
         small_blind_player = self.players[self.small_blind_index % num_players]
         big_blind_player = self.players[(self.small_blind_index + 1) % num_players]
 
         # Players post small and big blinds
         # Since blinds start a new betting cycle, small blind doesn't need a higher current_highest_bet.
-        self.pot += small_blind_player.bet(small_blind_amount, 0)
+        paid = small_blind_player.bet(small_blind_amount, 0)
+        self._collect(small_blind_player, paid)
+        self._record_blind(small_blind_player, SMALL_BLIND, paid)
         self.current_highest_bet = small_blind_amount  # Update after small blind is posted
-        self.pot += big_blind_player.bet(big_blind_amount, self.current_highest_bet)
+        paid = big_blind_player.bet(big_blind_amount, self.current_highest_bet)
+        self._collect(big_blind_player, paid)
+        self._record_blind(big_blind_player, BIG_BLIND, paid)
         self.current_highest_bet = big_blind_amount  # Update after big blind
 
         # Rotate the small blind index for the next game
@@ -94,15 +107,27 @@ class Game:
         # Additional round details like dealing community cards would go here
 
     def deal_cards(self):
-        """Deals two cards to each player."""
-        for player in self.players:
-            player.add_card(self.deck.deal())
-            player.add_card(self.deck.deal())
+        """Deals two cards to each player.
+
+        Player.add_card keeps a hand that already holds two cards, so each
+        hand state is built from the cards the player actually holds.
+        """
+        for seat, player in enumerate(self.players):
+            for _ in range(2):
+                card = self.deck.deal()
+                player.add_card(card)
+                if self.recorder is not None and card in player.hand:
+                    self.recorder.deal(seat, card)
+        self.hand_states = [evaluator.HandState([card.code for card in player.hand])
+                            for player in self.players]
 
     def betting_round(self):
         """Handles a round of betting among players."""
-        for player in self.players:
+        if self.recorder is not None:
+            self.recorder.set_phase(phase_of(self.community_cards))
+        for seat, player in enumerate(self.players):
             if player.is_active:
+                contributed = self.contributions[seat]
                 print(f"Current highest bet: {self.current_highest_bet}")
                 decision = input(f"Player {player.num}, choose 'fold', 'check', 'call', 'bet', or 'all-in': ").strip().lower()
                 if decision == 'fold':
@@ -111,132 +136,101 @@ class Game:
                     if self.current_highest_bet > 0 and player.current_bet < self.current_highest_bet:
                         print("Cannot check, there is an active bet.")
                         continue  # Ask for a new decision
-                    player.check()
+                    player.check(self.current_highest_bet)
                 elif decision == 'call':
                     if self.current_highest_bet == 0:
                         print("Nothing to call; you might want to check.")
                         continue  # Ask for a new decision
-                    self.pot += player.call(self.current_highest_bet)
+                    self._collect(player, player.call(self.current_highest_bet))
                 elif decision == 'bet':
                     while True:
                         amount = int(input("Enter bet amount: "))
                         if amount < 2 * self.current_highest_bet:
                             print(f"Bet must be at least twice the current highest bet, which is {2 * self.current_highest_bet}.")
                             continue
-                        self.pot += player.bet(amount)
+                        self._collect(player, player.bet(amount, self.current_highest_bet))
                         self.current_highest_bet = max(self.current_highest_bet, amount)
                         break
                 elif decision == 'all-in':
-                    self.pot += player.all_in()
+                    self._collect(player, player.all_in())
+                if self.recorder is not None and decision in ACTIONS:
+                    self.recorder.action(seat, decision, self.contributions[seat] - contributed)
+                if self.instruments is not None and decision in ACTIONS:
+                    self.instruments.count(f"action.{decision}")
                 print(f"Player {player.num} now has {player.chips} chips.")
     
     def deal_flop(self):
         """Deals the flop after burning a card."""
         self.deck.deal()  # Burn a card
         for _ in range(3):
-            self.community_cards.append(self.deck.deal())
+            self._deal_board_card()
 
     def deal_turn_or_river(self):
         """Deals the turn or the river after burning a card."""
         self.deck.deal()  # Burn a card
-        self.community_cards.append(self.deck.deal())
+        self._deal_board_card()
     
     def show_community_cards(self):
         """Returns a formatted string of the community cards."""
         return f"Community Cards: {[str(card) for card in self.community_cards]}"
     
     def evaluate_winner(self):
-        hand_scores = {}
-        for player in self.players:
-            all_cards = player.hand + self.community_cards
-            hand_scores[player] = self.rank_hand(all_cards)
-        
-        # Find the highest score based on hand rank and kicker information
-        highest_score = max(hand_scores.values(), key=lambda x: (x[0], x[1]))
-        potential_winners = [player for player, score in hand_scores.items() if score == highest_score]
+        """Pays the main pot and any side pots to the best eligible hands.
 
-        if len(potential_winners) == 1:
-            winner = potential_winners[0]
-            hand_info = print_hand_info(highest_score[0], highest_score[1])
-            print(f"The winner is {winner} with {hand_info}.")
-        else:
-            # Check for exact ties, including all kickers
-            best_kickers = sorted(hand_scores.items(), key=lambda x: (x[1][0], x[1][1]), reverse=True)
-            winning_kickers = best_kickers[0][1][1]
-            top_winners = [player for player, score in hand_scores.items() if score[1] == winning_kickers]
-
-            if len(top_winners) == 1:
-                winner = top_winners[0]
-                kicker_that_decided = next((kicker for kicker in winning_kickers if kicker not in (score[1] for player, score in hand_scores.items() if player != winner)), None)
-                hand_info = print_hand_info(highest_score[0][0], highest_score[1])
-                print(f"The winner is {winner} with {hand_info} and a {kicker_that_decided} kicker.")
-            else:
-                print("It's a tie between the following players:")
-                for winner in top_winners:
-                    hand_info = print_hand_info(highest_score[0], highest_score[1])
-                    print(f"{winner} with {hand_info}")
-                                    
-    def rank_hand(self, cards):
-        ranks = [card.rank if card.rank != 1 else 14 for card in cards]
-        suits = [card.suit for card in cards]
+        Each active player's strength comes from their incremental hand state
+        and is reused for every pot.
+        Returns a dict of the chips won by each player.
+        """
+        with phase_timer(self.instruments, 'evaluate'):
+            strengths = {seat: self.hand_strength(seat)
+                         for seat, player in enumerate(self.players) if player.is_active}
 
-        rank_counts = Counter(ranks)
-        suit_counts = Counter(suits)
+        with phase_timer(self.instruments, 'distribute'):
+            pots = build_pots(self.contributions, [player.is_active for player in self.players])
+            small_blind_seat = (self.small_blind_index - 1) % len(self.players)
+            payouts, winners = award_pots(pots, strengths, small_blind_seat, len(self.players))
+            self.side_pots = pots[1:]
+            for seat, amount in payouts.items():
+                self.players[seat].chips += amount
 
-        sorted_ranks_by_count_then_value = sorted(rank_counts.items(), key=lambda item: (-item[1], item[0]))
-        sorted_by_rank = sorted(ranks, reverse=True)
-
-        is_flush = False
-        flush_cards = []
-        for suit, count in suit_counts.items():
-            if count >= 5:
-                is_flush = True
-                flush_suit = suit
-                flush_cards = sorted([card.rank for card in cards if card.suit == suit], reverse=True)
-
-        # Checking for straights, considering Aces both high and low
-        is_straight, straight_high_card = self.check_straight(sorted_by_rank)
-
-        # Checking for straight flush or royal flush
-        if is_flush and is_straight:
-            if self.check_straight_flush(cards, flush_suit, straight_high_card):
-                if straight_high_card == 14:  # Royal Flush
-                    return (10, [14])  # Ace high
-                return (9, [straight_high_card])
-            return (6, flush_cards[:5])  # Regular Flush
-
-        # Evaluate other hands
-        if sorted_ranks_by_count_then_value[0][1] == 4:
-            four_rank = sorted_ranks_by_count_then_value[0][0]
-            kicker = max(rank for rank in sorted_by_rank if rank != four_rank)
-            return (8, [four_rank, kicker])
+        for number, (pot, pot_winners) in enumerate(zip(pots, winners)):
+            name = "main pot" if number == 0 else f"side pot {number}"
+            hand_info = print_hand_info(*evaluator.describe(strengths[pot_winners[0]]))
+            if len(pot_winners) == 1:
+                print(f"The winner of the {name} of {pot.amount} is {self.players[pot_winners[0]]} with {hand_info}.")
+            else:
+                print(f"The {name} of {pot.amount} is split between the following players:")
+                for seat in pot_winners:
+                    print(f"{self.players[seat]} with {hand_info}")
 
-        if sorted_ranks_by_count_then_value[0][1] == 3:
-            three_rank = sorted_ranks_by_count_then_value[0][0]
-            if len(sorted_ranks_by_count_then_value) > 1 and sorted_ranks_by_count_then_value[1][1] == 2:
-                pair_rank = sorted_ranks_by_count_then_value[1][0]
-                return (7, [three_rank, pair_rank])  # Full House
-            kickers = [rank for rank in sorted_by_rank if rank != three_rank][:2]
-            return (4, [three_rank] + kickers)  # Three of a Kind
+        if self.recorder is not None:
+            for seat, contributed in enumerate(self.contributions):
+                self.recorder.result(seat, payouts.get(seat, 0) - contributed)
+            self.recorder.end_hand()
+        self.hands_played += 1
+        return {self.players[seat]: amount for seat, amount in payouts.items()}
 
-        if sorted_ranks_by_count_then_value[0][1] == 2:
-            pairs = [(rank, count) for rank, count in sorted_ranks_by_count_then_value if count == 2]
-            pairs = sorted(pairs, reverse=True, key=lambda x: x[0])  # Ensure highest pairs are first
-            if len(pairs) > 1:
-                high_pair, low_pair = pairs[0][0], pairs[1][0]
-                kicker = max(rank for rank in sorted_by_rank if rank not in (high_pair, low_pair))
-                return (3, [high_pair, low_pair, kicker]) # Two Pair
-            pair_rank = pairs[0][0]
-            kickers = [rank for rank in sorted_by_rank if rank != pair_rank][:3]
-            return (2, [pair_rank] + kickers)  # One Pair
+    def hand_strength(self, seat):
+        """Returns the evaluator strength of a seat's hole cards plus the board so far,
+        kept up to date as cards are dealt."""
+        return self.hand_states[seat].strength
 
-        if is_straight:
-            return (5, [straight_high_card])  # Straight
+    def snapshot(self, include_rng=False):
+        """Returns a compact GameSnapshot of the current state (see src.game.snapshot)."""
+        return take_snapshot(self, include_rng)
 
-        if is_flush:
-            return (6, flush_cards)  # Flush
+    def restore(self, snap):
+        """Restores a state returned by snapshot()."""
+        restore_snapshot(self, snap)
+        board = [card.code for card in self.community_cards]
+        self.hand_states = [evaluator.HandState([card.code for card in player.hand] + board)
+                            for player in self.players]
 
-        return (1, sorted_by_rank[:5])  # High Card
+    def rank_hand(self, cards):
+        """Returns the (category, kickers) tuple of the best hand in cards."""
+        if self.rank_cache is not None:
+            return evaluator.describe(self.rank_cache.evaluate_cards(cards))
+        return evaluator.describe(evaluator.evaluate_cards(cards))
 
     def check_straight(self, ranks):
         """Check for a straight and return the highest card if a straight exists."""
@@ -267,16 +261,32 @@ class Game:
 
     def play_round(self):
         """Plays a round of poker."""
-        self.deck.shuffle()
+        instruments = self.instruments
+        with phase_timer(instruments, 'shuffle'):
+            self.deck.shuffle()
         self.community_cards = []
-        self.post_blinds_and_antes()
-        self.deal_cards()
-        self.betting_round()
-        self.deal_flop()
-        self.betting_round()
-        self.deal_turn_or_river()
-        self.betting_round()
-        self.deal_turn_or_river()
-        self.betting_round()
+        self.side_pots = []
+        self.contributions = [0] * len(self.players)
+        with phase_timer(instruments, 'blinds'):
+            self.post_blinds_and_antes()
+        with phase_timer(instruments, 'deal'):
+            self.deal_cards()
+        with phase_timer(instruments, 'betting.preflop'):
+            self.betting_round()
+        with phase_timer(instruments, 'deal'):
+            self.deal_flop()
+        with phase_timer(instruments, 'betting.flop'):
+            self.betting_round()
+        with phase_timer(instruments, 'deal'):
+            self.deal_turn_or_river()
+        with phase_timer(instruments, 'betting.turn'):
+            self.betting_round()
+        with phase_timer(instruments, 'deal'):
+            self.deal_turn_or_river()
+        with phase_timer(instruments, 'betting.river'):
+            self.betting_round()
         self.evaluate_winner()
-        self.pot = 0  # Reset the pot after the round
\ No newline at end of file
+        self.pot = 0  # Reset the pot after the round
+        if instruments is not None:
+            instruments.count('hands')
+            instruments.maybe_dump()
\ No newline at end of file
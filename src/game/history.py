@@ -0,0 +1,150 @@
+"""
+Hand history recording
+
+Hands are logged as fixed-width 16-byte binary records (blinds, deals,
+actions and results) appended to a file, and read back with a generator over
+a memory map of the file, so logs far larger than memory can be streamed.
+"""
+
+import mmap
+import os
+import struct
+
+from src.game.engine import ACTIONS, BOARD_SEAT, FLOP, PHASES, PREFLOP, RIVER, TURN
+
+# kind, seat, value, phase, hand number, amount
+RECORD = struct.Struct('<BBBBIq')
+
+# Record kinds
+HAND_START = 0  # seat: number of players, value: small blind seat
+BLIND = 1       # value: ANTE, SMALL_BLIND or BIG_BLIND, amount: chips posted
+DEAL = 2        # seat: player or BOARD, value: card code
+ACTION = 3      # value: index into ACTIONS, amount: chips committed
+RESULT = 4      # amount: net chips won or lost over the hand
+HAND_END = 5
+
+BOARD = BOARD_SEAT
+
+_PHASE_BY_BOARD_SIZE = {0: PREFLOP, 3: FLOP, 4: TURN, 5: RIVER}
+
+def phase_of(community_cards):
+    """Returns the betting phase implied by the number of community cards."""
+    return _PHASE_BY_BOARD_SIZE[len(community_cards)]
+
+class HandRecorder:
+    """Appends hand histories to a binary log file.
+
+    Records are buffered in memory and written out a whole hand at a time
+    every flush_every hands, so the file only ever holds complete hands.
+    """
+
+    def __init__(self, path, flush_every=1000):
+        """Opens path for appending."""
+        self.file = open(path, 'ab')
+        self.flush_every = flush_every
+        self.buffer = bytearray()
+        self.pending_hands = 0
+        self.hand_number = 0
+        self.phase = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, kind, seat=0, value=0, amount=0):
+        """Buffers one record for the current hand."""
+        self.buffer += RECORD.pack(kind, seat, value, self.phase, self.hand_number, amount)
+
+    def start_hand(self, hand_number, num_players, small_blind_seat):
+        """Begins a new hand."""
+        self.hand_number = hand_number & 0xFFFFFFFF
+        self.phase = 0
+        self._write(HAND_START, num_players, small_blind_seat)
+
+    def set_phase(self, phase):
+        """Sets the phase (a name from PHASES) stamped on later records."""
+        self.phase = PHASES.index(phase)
+
+    def blind(self, seat, blind, amount):
+        """Records an ante or blind posted by seat."""
+        self._write(BLIND, seat, blind, amount)
+
+    def deal(self, seat, card):
+        """Records a hole card dealt to seat, or a board card if seat is BOARD."""
+        self._write(DEAL, seat, card.code)
+
+    def action(self, seat, action, amount):
+        """Records an action (a name from ACTIONS) and the chips it committed."""
+        self._write(ACTION, seat, ACTIONS.index(action), amount)
+
+    def result(self, seat, net):
+        """Records a seat's net chip result for the hand."""
+        self._write(RESULT, seat, 0, net)
+
+    def end_hand(self):
+        """Finishes the current hand, flushing to disk every flush_every hands."""
+        self._write(HAND_END)
+        self.pending_hands += 1
+        if self.pending_hands >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Writes all buffered hands to the file."""
+        self.file.write(self.buffer)
+        self.file.flush()
+        self.buffer.clear()
+        self.pending_hands = 0
+
+    def close(self):
+        """Flushes buffered hands and closes the file."""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+class HandHistory:
+    """One hand read back from a log."""
+
+    def __init__(self, hand_number, num_players, small_blind_seat):
+        """Creates an empty hand."""
+        self.hand_number = hand_number
+        self.num_players = num_players
+        self.small_blind_seat = small_blind_seat
+        self.blinds = []  # (seat, ANTE/SMALL_BLIND/BIG_BLIND, amount)
+        self.hole_cards = [[] for _ in range(num_players)]  # Card codes
+        self.board = []  # Card codes
+        self.actions = []  # (phase name, seat, action name, amount)
+        self.results = [0] * num_players
+
+    def __str__(self):
+        """Returns a one-line summary of the hand."""
+        return (f"Hand {self.hand_number}: {len(self.actions)} actions, "
+                f"board {self.board}, results {self.results}")
+
+def read_hands(path):
+    """Yields each complete HandHistory in a log, reading it through a memory map."""
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        hand = None
+        for offset in range(0, len(data) - RECORD.size + 1, RECORD.size):
+            kind, seat, value, phase, number, amount = RECORD.unpack_from(data, offset)
+            if kind == HAND_START:
+                hand = HandHistory(number, seat, value)
+            elif hand is None:
+                continue  # Skip a hand whose start was cut off
+            elif kind == BLIND:
+                hand.blinds.append((seat, value, amount))
+            elif kind == DEAL:
+                if seat == BOARD:
+                    hand.board.append(value)
+                else:
+                    hand.hole_cards[seat].append(value)
+            elif kind == ACTION:
+                hand.actions.append((PHASES[phase], seat, ACTIONS[value], amount))
+            elif kind == RESULT:
+                hand.results[seat] = amount
+            elif kind == HAND_END:
+                yield hand
+                hand = None
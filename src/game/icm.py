@@ -0,0 +1,63 @@
+"""
+Independent Chip Model
+
+Converts tournament chip stacks into shares of the prize pool. Under the
+Malmuth-Harville model a player finishes first with probability stack /
+total chips, then the next place is decided the same way among the rest.
+Expected prizes for every set of players still in contention are memoized
+by a bitmask of the set, and sets that can only finish out of the money are
+never expanded, so 9-10 players with a handful of paid places take a few
+milliseconds.
+"""
+
+def icm_equity(stacks, payouts):
+    """Returns each player's expected prize for the given stacks.
+
+    payouts lists the prize for 1st place, 2nd place and so on; places
+    beyond it pay nothing. Players with no chips finish after everyone else.
+    """
+    count = len(stacks)
+    if count == 0:
+        return []
+    if any(stack < 0 for stack in stacks):
+        raise ValueError("Stacks cannot be negative.")
+    alive = [i for i in range(count) if stacks[i] > 0]
+    equities = [0.0] * count
+
+    # Busted players share the places below everyone still alive, in seat order
+    for place, i in enumerate([i for i in range(count) if stacks[i] == 0], start=len(alive)):
+        if place < len(payouts):
+            equities[i] = payouts[place]
+
+    players = len(alive)
+    chips = [stacks[i] for i in alive]
+    paid = min(len(payouts), players)
+    memo = {}
+
+    def expected(mask):
+        """Expected prizes of the players in mask (indexes into alive) for the
+        places still to be decided among them."""
+        result = memo.get(mask)
+        if result is not None:
+            return result
+        remaining = [j for j in range(players) if mask >> j & 1]
+        place = players - len(remaining)
+        result = [0.0] * players
+        if place < paid:
+            total = sum(chips[j] for j in remaining)
+            prize = payouts[place]
+            for j in remaining:
+                probability = chips[j] / total
+                result[j] += probability * prize
+                if len(remaining) > 1:
+                    rest = expected(mask & ~(1 << j))
+                    for k in remaining:
+                        if k != j:
+                            result[k] += probability * rest[k]
+        memo[mask] = result
+        return result
+
+    if players:
+        for j, value in enumerate(expected((1 << players) - 1)):
+            equities[alive[j]] = value
+    return equities
@@ -1,13 +1,16 @@
 import pygame
 
+from src.game.render import get_font
+
 class InputBox:
     def __init__(self, x, y, w, h, text=''):
         self.rect = pygame.Rect(x, y, w, h)
         self.color = (255, 255, 255)  # White color
         self.text = text
-        self.font = pygame.font.Font(None, 32)
+        self.font = get_font(32)
         self.txt_surface = self.font.render(text, True, self.color)
         self.active = False
+        self._surface = None  # Box and text, rebuilt when either changes
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -18,7 +21,10 @@ class InputBox:
             else:
                 self.active = False
             # Change the current color of the input box.
-            self.color = (0, 128, 0) if self.active else (255, 255, 255)
+            color = (0, 128, 0) if self.active else (255, 255, 255)
+            if color != self.color:
+                self.color = color
+                self._surface = None
         if event.type == pygame.KEYDOWN:
             if self.active:
                 if event.key == pygame.K_RETURN:
@@ -30,12 +36,21 @@ class InputBox:
                     self.text += event.unicode
                 # Re-render the text.
                 self.txt_surface = self.font.render(self.text, True, self.color)
+                self._surface = None
+
+    def get_surface(self):
+        """Returns the box and its text on a transparent surface the size of
+        the box, re-rendered only when the text or color changes."""
+        if self._surface is None:
+            surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            surface.blit(self.txt_surface, (5, 5))
+            pygame.draw.rect(surface, self.color, surface.get_rect(), 2)
+            self._surface = surface
+        return self._surface
 
     def draw(self, screen):
-        # Blit the text.
-        screen.blit(self.txt_surface, (self.rect.x+5, self.rect.y+5))
-        # Blit the rect.
-        pygame.draw.rect(screen, self.color, self.rect, 2)
+        # Blit the text and the rect.
+        screen.blit(self.get_surface(), self.rect)
 
     def get_text(self):
         return self.text
@@ -43,3 +58,4 @@ class InputBox:
     def clear_text(self):
         self.text = ""
         self.txt_surface = self.font.render(self.text, True, self.color)
+        self._surface = None
@@ -0,0 +1,171 @@
+"""
+Opt-in timing and counters for the game loop
+
+An Instruments object collects a timing histogram per named phase (blinds,
+deal, each betting round, evaluation, pot distribution, frame drawing, ...)
+and plain counters. Game and the GUI loop only touch it when one is passed
+in, and time phases through phase_timer(), which hands back a shared no-op
+context manager when instrumentation is off.
+
+Set HOLDEM_INSTRUMENTS to a number of seconds to have the GUI dump a JSON
+snapshot to stderr that often.
+"""
+
+from bisect import bisect_left
+from contextlib import nullcontext
+import json
+import os
+import sys
+import time
+
+ENVIRONMENT_VARIABLE = 'HOLDEM_INSTRUMENTS'
+
+# Upper bounds of the histogram buckets in seconds: 1us, 2us, 4us, ... about 17 minutes,
+# with a final bucket for anything longer
+BUCKET_BOUNDS = tuple(1e-6 * 2 ** i for i in range(30))
+
+NO_PHASE = nullcontext()
+
+class Histogram:
+    """Counts of durations in power-of-two buckets, with exact count, total, min and max."""
+
+    __slots__ = ('buckets', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        """Creates an empty histogram."""
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def record(self, seconds):
+        """Adds one duration."""
+        self.buckets[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """Returns an upper bound on the q-th percentile (0 to 100), from the buckets."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(BUCKET_BOUNDS[index], self.max) if index < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def to_dict(self):
+        """Returns a JSON-serializable summary, with only the non-empty buckets."""
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'buckets': {(f"{BUCKET_BOUNDS[i]:.6g}" if i < len(BUCKET_BOUNDS) else 'inf'): count
+                        for i, count in enumerate(self.buckets) if count},
+        }
+
+class _PhaseTimer:
+    """Context manager that records the time spent in one phase."""
+
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.record(time.perf_counter() - self.start)
+
+class Instruments:
+    """Per-phase timing histograms and counters.
+
+    If dump_interval is given, maybe_dump() passes a snapshot to dump (by
+    default, JSON on stderr) at most once per dump_interval seconds.
+    """
+
+    def __init__(self, dump_interval=None, dump=None):
+        """Creates empty instruments."""
+        self.histograms = {}
+        self.counters = {}
+        self._timers = {}
+        self.dump_interval = dump_interval
+        self.dump = dump if dump is not None else _dump_to_stderr
+        self.started = self.last_dump = time.perf_counter()
+
+    def phase(self, name):
+        """Returns a context manager timing one pass through the named phase.
+
+        Timers are reused, so the same phase must not be timed inside itself.
+        """
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = _PhaseTimer(self.histogram(name))
+        return timer
+
+    def histogram(self, name):
+        """Returns the named Histogram, creating it if needed."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def record(self, name, seconds):
+        """Adds a duration measured elsewhere to the named histogram."""
+        self.histogram(name).record(seconds)
+
+    def count(self, name, amount=1):
+        """Adds amount to the named counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """Returns every counter and histogram as a JSON-serializable dict."""
+        return {
+            'elapsed': time.perf_counter() - self.started,
+            'counters': dict(self.counters),
+            'phases': {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+        }
+
+    def reset(self):
+        """Clears every counter and histogram."""
+        self.histograms.clear()
+        self.counters.clear()
+        self._timers.clear()
+        self.started = self.last_dump = time.perf_counter()
+
+    def maybe_dump(self):
+        """Dumps a snapshot if dump_interval seconds have passed since the last one."""
+        if self.dump_interval is not None:
+            now = time.perf_counter()
+            if now - self.last_dump >= self.dump_interval:
+                self.last_dump = now
+                self.dump(self.snapshot())
+
+def _dump_to_stderr(snapshot):
+    """Writes a snapshot to stderr as one line of JSON."""
+    print(json.dumps(snapshot), file=sys.stderr)
+
+def phase_timer(instruments, name):
+    """Returns instruments.phase(name), or a no-op context manager if instruments is None."""
+    return instruments.phase(name) if instruments is not None else NO_PHASE
+
+def from_environment():
+    """Returns Instruments dumping every HOLDEM_INSTRUMENTS seconds, or None if it is unset."""
+    interval = os.environ.get(ENVIRONMENT_VARIABLE)
+    if not interval:
+        return None
+    return Instruments(dump_interval=float(interval))
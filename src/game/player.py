@@ -3,13 +3,13 @@ Contains the Player class
 """
 
 from src.constants import CARD_WIDTH
-import src.game.utilities as utilities
 
 class Player:
     """A player of the poker game."""
 
-    def __init__(self, player_number, chips, pos, screen):
-        """Initializes a player object."""
+    def __init__(self, player_number, chips, pos=None, screen=None):
+        """Initializes a player object. pos and screen are only needed to draw
+        the player, so headless players can leave them out."""
         self.hand = []
         self.num = player_number
         self.chips = chips
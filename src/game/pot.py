@@ -0,0 +1,75 @@
+"""
+Pot and side-pot resolution
+
+Side pots are built at showdown from each player's total contribution to the
+hand in one pass over the contributions sorted by size, instead of being
+adjusted on every all-in. Hands are ranked once and the ranking is reused
+for every pot.
+"""
+
+class Pot:
+    """A main or side pot and the players who can win it."""
+
+    __slots__ = ('amount', 'eligible')
+
+    def __init__(self, amount, eligible):
+        """Creates a pot of amount chips contested by the eligible seats."""
+        self.amount = amount
+        self.eligible = eligible
+
+    def __repr__(self):
+        """Returns a short description of the pot."""
+        return f"Pot({self.amount}, eligible={self.eligible})"
+
+def build_pots(contributions, active):
+    """Splits the chips of a hand into a main pot and side pots.
+
+    contributions[i] is everything seat i put in this hand (folded seats
+    included) and active[i] says whether seat i is still in the hand. Returns
+    the pots from main to last side pot; each is contested by the active
+    seats that contributed at least its level.
+    """
+    # Walk from the largest contribution down, peeling off one level at a time
+    order = sorted(range(len(contributions)), key=contributions.__getitem__, reverse=True)
+    pots = []
+    eligible = []
+    carry = 0
+    for position, seat in enumerate(order):
+        if active[seat]:
+            eligible.append(seat)
+        level = contributions[seat]
+        next_level = contributions[order[position + 1]] if position + 1 < len(order) else 0
+        if level == next_level and (position + 1 < len(order) or not carry):
+            continue  # The last seat still settles chips left over from folded seats
+        amount = (level - next_level) * (position + 1) + carry
+        if not eligible:
+            carry = amount  # Nobody still in the hand reached this level
+        elif pots and len(pots[-1].eligible) == len(eligible):
+            pots[-1].amount += amount
+            carry = 0
+        else:
+            pots.append(Pot(amount, sorted(eligible)))
+            carry = 0
+    pots.reverse()
+    return pots
+
+def award_pots(pots, strengths, first_seat=0, seats=None):
+    """Pays each pot to its best eligible hands.
+
+    strengths maps every active seat to its hand strength. Odd chips of a
+    split pot go one at a time to its winners in seat order starting from
+    first_seat (e.g. the small blind), so payouts are deterministic. Returns (payouts, winners), where payouts maps seat to
+    chips won and winners lists the winning seats of each pot.
+    """
+    seats = seats if seats is not None else max(strengths) + 1
+    payouts = {}
+    winners = []
+    for pot in pots:
+        best = max(strengths[seat] for seat in pot.eligible)
+        pot_winners = [seat for seat in pot.eligible if strengths[seat] == best]
+        pot_winners.sort(key=lambda seat: (seat - first_seat) % seats)
+        share, odd = divmod(pot.amount, len(pot_winners))
+        for i, seat in enumerate(pot_winners):
+            payouts[seat] = payouts.get(seat, 0) + share + (1 if i < odd else 0)
+        winners.append(pot_winners)
+    return payouts, winners
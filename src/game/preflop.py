@@ -0,0 +1,122 @@
+"""
+Precomputed preflop equity table
+
+Preflop there are only 169 strategically distinct starting hands. Their
+equity against 1-9 random opponents is computed once by seeded Monte Carlo,
+saved as a small .npy file under src/resources/ and memory-mapped on lookup,
+so preflop queries are a single array read.
+
+Run ``python -m src.game.preflop`` to regenerate the file.
+"""
+
+import os
+
+import numpy as np
+
+from src.constants import PREFLOP_TABLE_PATH, RANK_KEYS
+from src.game.batch_evaluator import evaluate_batch
+from src.game.equity import to_codes
+
+MAX_OPPONENTS = 9
+PREFLOP_SEED = 20240501
+PREFLOP_SAMPLES = 50000
+
+_table = None
+
+# Number of two-card combos in each hand class: 6 per pair, 4 suited, 12 offsuit
+_COMBOS = np.array([6.0 if row == col else 4.0 if row > col else 12.0
+                    for row in range(13) for col in range(13)])
+
+def hand_index(hole):
+    """Returns the 0-168 class index of two hole cards (Card objects or codes).
+
+    Classes form a 13x13 grid of rank indexes: pairs on the diagonal,
+    suited hands at [high, low] and offsuit hands at [low, high].
+    """
+    first, second = to_codes(hole)
+    high, low = max(first % 13, second % 13), min(first % 13, second % 13)
+    if first // 13 == second // 13:
+        return high * 13 + low
+    return low * 13 + high
+
+def hand_name(index):
+    """Returns the usual name of a hand class, e.g. 'AKs', 'T9o' or '77'."""
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANK_KEYS[row] * 2
+    if row > col:
+        return RANK_KEYS[row] + RANK_KEYS[col] + 's'
+    return RANK_KEYS[col] + RANK_KEYS[row] + 'o'
+
+def representative(index):
+    """Returns one pair of card codes belonging to a hand class."""
+    row, col = divmod(index, 13)
+    if row > col:
+        return [row, col]  # Both spades
+    return [row, 13 + col]  # Spade and diamond (or a pair)
+
+def _simulate_hand(index, samples, rng):
+    """Estimates one hand class's equity against 1..MAX_OPPONENTS opponents.
+
+    Each sample deals MAX_OPPONENTS hands and a board; the first k of those
+    hands are the opponents for the k-opponent estimate.
+    """
+    hole = representative(index)
+    live = np.array([code for code in range(52) if code not in hole], dtype=np.int64)
+    needed = 2 * MAX_OPPONENTS + 5
+    deals = live[np.argsort(rng.random((samples, len(live))), axis=1)[:, :needed]]
+    board = deals[:, :5]
+
+    hero = evaluate_batch(np.hstack([np.tile(hole, (samples, 1)), board]))
+    best_other = np.zeros(samples, dtype=np.int64)
+    ties = np.zeros(samples, dtype=np.int64)
+    equities = np.empty(MAX_OPPONENTS, dtype=np.float32)
+    for k in range(MAX_OPPONENTS):
+        villain = evaluate_batch(np.hstack([deals[:, 5 + 2 * k:7 + 2 * k], board]))
+        ties = np.where(villain > best_other, 0, ties)
+        ties += villain == np.maximum(best_other, villain)
+        best_other = np.maximum(best_other, villain)
+        share = np.where(hero > best_other, 1.0, 0.0)
+        share += np.where(hero == best_other, 1.0 / (ties + 1), 0.0)
+        equities[k] = share.mean()
+    return equities
+
+def generate_table(samples=PREFLOP_SAMPLES, seed=PREFLOP_SEED):
+    """Computes the (169, MAX_OPPONENTS) equity table deterministically from seed."""
+    children = np.random.SeedSequence(seed).spawn(169)
+    table = np.empty((169, MAX_OPPONENTS), dtype=np.float32)
+    for index in range(169):
+        table[index] = _simulate_hand(index, samples, np.random.default_rng(children[index]))
+    return table
+
+def save_table(table, path=PREFLOP_TABLE_PATH):
+    """Writes an equity table to disk."""
+    np.save(path, table)
+
+def load_table(path=PREFLOP_TABLE_PATH):
+    """Returns the memory-mapped equity table, generating it first if missing."""
+    global _table
+    if _table is None:
+        if not os.path.exists(path):
+            save_table(generate_table(), path)
+        _table = np.load(path, mmap_mode='r')
+    return _table
+
+def preflop_equity(hole, opponents=1):
+    """Returns the equity of hole cards against a number of random opponents."""
+    if not 1 <= opponents <= MAX_OPPONENTS:
+        raise ValueError(f"Opponents must be between 1 and {MAX_OPPONENTS}.")
+    return float(load_table()[hand_index(hole), opponents - 1])
+
+def hand_strength(hole, opponents=1):
+    """Returns the share of starting hands (weighted by combos) that the hole
+    cards beat in equity against the given number of opponents."""
+    if not 1 <= opponents <= MAX_OPPONENTS:
+        raise ValueError(f"Opponents must be between 1 and {MAX_OPPONENTS}.")
+    column = np.asarray(load_table()[:, opponents - 1])
+    equity = column[hand_index(hole)]
+    return float(_COMBOS[column < equity].sum() / _COMBOS.sum())
+
+if __name__ == "__main__":
+    save_table(generate_table())
+    print(f"Wrote {PREFLOP_TABLE_PATH}")
@@ -0,0 +1,294 @@
+"""
+Hand ranges and range-vs-range equity
+
+A Range is a set of two-card combos with weights, built from the usual
+notation ("QQ+, AKs, AJo+, 76s:0.5, AsKd"), from the top share of starting
+hands, or combo by combo. Combos blocked by known or dead cards are removed
+up front, and combos are drawn in proportion to their weights from a
+precomputed alias table, so each draw costs two random numbers.
+
+range_equity() samples boards and, on each board, many matchups of combos;
+every distinct combo is scored once per board with the board work shared
+(evaluator.evaluate_shared) and the score is reused by every matchup on it.
+"""
+
+import math
+import random
+
+import numpy as np
+
+from src.constants import RANK_KEYS, SUIT_KEYS
+from src.game.card import code_to_key, key_to_code, to_mask
+from src.game.equity import EquityResult, to_codes
+import src.game.evaluator as evaluator
+from src.game.preflop import _COMBOS, MAX_OPPONENTS, hand_name, load_table
+
+class AliasTable:
+    """Walker/Vose alias table for O(1) sampling of indexes by weight."""
+
+    def __init__(self, weights):
+        """Builds the table; weights must be non-negative with a positive sum."""
+        count = len(weights)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            raise ValueError("An alias table needs at least one positive weight.")
+        scaled = [weight * count / total for weight in weights]
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1 up to rounding error and keeps probability 1
+
+    def sample(self, rng):
+        """Returns one index drawn in proportion to its weight."""
+        index = int(rng.random() * len(self.probability))
+        return index if rng.random() < self.probability[index] else self.alias[index]
+
+def _class_combos(high, low, kind):
+    """Returns the combos (pairs of codes) of ranks high >= low (0-12 indexes);
+    kind is 's' for suited, 'o' for offsuit or '' for both."""
+    combos = []
+    for first_suit in range(4):
+        for second_suit in range(4):
+            if high == low and second_suit <= first_suit:
+                continue
+            suited = first_suit == second_suit
+            if (kind == 's' and not suited) or (kind == 'o' and suited):
+                continue
+            combos.append((first_suit * 13 + high, second_suit * 13 + low))
+    return combos
+
+def _parse_token(token):
+    """Returns the combos named by one range token without its weight."""
+    if len(token) == 4 and token[1] in SUIT_KEYS and token[3] in SUIT_KEYS:  # e.g. AsKd
+        return [(key_to_code(token[:2]), key_to_code(token[2:]))]
+
+    plus = token.endswith('+')
+    body = token[:-1] if plus else token
+    if len(body) not in (2, 3) or any(rank not in RANK_KEYS for rank in body[:2]):
+        raise ValueError(f"Invalid range token: {token}")
+    kind = body[2] if len(body) == 3 else ''
+    if kind not in ('', 's', 'o'):
+        raise ValueError(f"Invalid range token: {token}")
+    first, second = RANK_KEYS.index(body[0]), RANK_KEYS.index(body[1])
+    high, low = max(first, second), min(first, second)
+
+    if high == low:
+        if kind:
+            raise ValueError(f"Pairs cannot be suited or offsuit: {token}")
+        pairs = range(high, 13) if plus else [high]  # 77+ is 77 through AA
+        return [combo for rank in pairs for combo in _class_combos(rank, rank, '')]
+    kickers = range(low, high) if plus else [low]  # ATs+ is ATs through AKs
+    return [combo for kicker in kickers for combo in _class_combos(high, kicker, kind)]
+
+class Range:
+    """Weighted two-card combos, stored as {(code, code): weight}."""
+
+    def __init__(self, combos=None):
+        """Creates a range from an iterable of combos or a {combo: weight} dict."""
+        self.weights = {}
+        if isinstance(combos, dict):
+            for combo, weight in combos.items():
+                self.add(combo, weight)
+        elif combos is not None:
+            for combo in combos:
+                self.add(combo)
+
+    @classmethod
+    def parse(cls, text):
+        """Builds a range from comma-separated tokens like "QQ+, AKs, AJo+, 76s:0.5, AsKd".
+
+        A weight after a colon applies to every combo of the token; later
+        tokens override earlier weights for the same combo.
+        """
+        result = cls()
+        for token in text.replace(' ', '').split(','):
+            if not token:
+                continue
+            token, _, weight = token.partition(':')
+            for combo in _parse_token(token):
+                result.add(combo, float(weight) if weight else 1.0)
+        return result
+
+    @classmethod
+    def top(cls, percent, opponents=1):
+        """Builds a range of the strongest percent of starting hands, ranked by
+        preflop equity against the given number of opponents."""
+        if not 1 <= opponents <= MAX_OPPONENTS:
+            raise ValueError(f"Opponents must be between 1 and {MAX_OPPONENTS}.")
+        column = np.asarray(load_table()[:, opponents - 1])
+        limit = percent / 100 * _COMBOS.sum()
+        result = cls()
+        taken = 0.0
+        for index in np.argsort(-column, kind='stable'):
+            if taken >= limit:
+                break
+            result.weights.update(dict.fromkeys(_parse_token(hand_name(index)), 1.0))
+            taken += _COMBOS[index]
+        return result
+
+    def add(self, combo, weight=1.0):
+        """Adds (or reweights) one combo of two Card objects or codes."""
+        first, second = to_codes(combo)
+        if first == second:
+            raise ValueError("A combo needs two different cards.")
+        if weight < 0:
+            raise ValueError("Combo weights cannot be negative.")
+        self.weights[(min(first, second), max(first, second))] = weight
+
+    def without(self, dead):
+        """Returns a copy without the combos that use any of the dead cards
+        (Card objects or codes, e.g. known hole cards plus Game.community_cards)."""
+        dead_mask = to_mask(to_codes(dead))
+        return Range({combo: weight for combo, weight in self.weights.items()
+                      if not dead_mask & ((1 << combo[0]) | (1 << combo[1]))})
+
+    def combos(self):
+        """Returns the combos with positive weight, in a fixed order."""
+        return [combo for combo in sorted(self.weights) if self.weights[combo] > 0]
+
+    def sampler(self):
+        """Returns (combos, AliasTable) for drawing combos by weight."""
+        combos = self.combos()
+        return combos, AliasTable([self.weights[combo] for combo in combos])
+
+    def __len__(self):
+        """Returns the number of combos with positive weight."""
+        return sum(1 for weight in self.weights.values() if weight > 0)
+
+    def __str__(self):
+        """Returns the range's combos as card keys, with weights other than 1."""
+        names = []
+        for (first, second), weight in sorted(self.weights.items()):
+            if weight > 0:
+                if first % 13 < second % 13:
+                    first, second = second, first  # Higher rank first, e.g. AsKd
+                names.append(code_to_key(first) + code_to_key(second) + ('' if weight == 1 else f":{weight:g}"))
+        return ', '.join(names)
+
+def _as_range(player):
+    """Returns a Range for a player given as a Range, range text or two cards."""
+    if isinstance(player, Range):
+        return player
+    if isinstance(player, str):
+        return Range.parse(player)
+    return Range([player])
+
+def range_equity(players, board=(), dead=(), precision=0.005, confidence=0.95, min_samples=1000,
+                 max_samples=1000000, matchups_per_board=64, rng=None):
+    """Estimates each player's equity when players hold ranges.
+
+    players is a list whose entries are each a Range, range text such as
+    "QQ+, AKs", or two known hole cards. board holds the known
+    community cards (e.g. Game.community_cards) and dead any other cards known
+    to be out of play. Combos using known hole cards, board or dead cards are
+    removed first.
+
+    Each sample is one matchup: a combo per player drawn by weight, on a
+    board drawn from the remaining cards. matchups_per_board matchups are
+    drawn per board, and those colliding with the board or each other are
+    discarded, which leaves every matchup weighted correctly. Matchups on the
+    same board are correlated, so confidence intervals treat each board as
+    one sample (a ratio estimate of its total share over its matchups).
+    Stops once each player's equity interval is within +/- precision, or
+    after max_samples matchups.
+    """
+    rng = rng if rng is not None else random.Random()
+    board = to_codes(board)
+    if len(board) > 5:
+        raise ValueError("The board cannot have more than five cards.")
+    ranges = [_as_range(player) for player in players]
+    if not ranges:
+        raise ValueError("At least one player is required.")
+    known = to_codes(dead) + board
+    for player_range in ranges:
+        if len(player_range) == 1:
+            known += player_range.combos()[0]  # Exact hands block everyone else's combos
+    if len(set(known)) != len(known):
+        raise ValueError("The same card appears more than once.")
+    samplers = []
+    for player_range in ranges:
+        exact = len(player_range) == 1
+        blocked = [code for code in known if not exact or code not in player_range.combos()[0]]
+        live_range = player_range.without(blocked)
+        if not len(live_range):
+            raise ValueError("A range has no combos left after removing blocked cards.")
+        samplers.append(live_range.sampler())
+
+    known_mask = to_mask(known)
+    live = [code for code in range(52) if not known_mask & (1 << code)]
+    needed = 5 - len(board)
+    count = len(ranges)
+    wins, ties = [0] * count, [0] * count
+    shares, share_squares = [0.0] * count, [0.0] * count
+    # Per-board totals for the batch standard error: sums of S^2 and S * n
+    # for each player's board share total S over n matchups, and of n^2
+    board_squares, board_products = [0.0] * count, [0.0] * count
+    matchup_squares = 0
+
+    def result():
+        """Returns the EquityResult for the samples so far."""
+        errors = None
+        if boards > 1:
+            errors = []
+            for i in range(count):
+                mean = shares[i] / samples
+                deviations = (board_squares[i] - 2 * mean * board_products[i]
+                              + mean * mean * matchup_squares)
+                errors.append(math.sqrt(max(deviations, 0.0) * boards / (boards - 1)) / samples)
+        return EquityResult(wins, ties, shares, share_squares, samples, confidence,
+                            standard_errors=errors)
+
+    samples = boards = draws = 0
+    while samples < max_samples and draws < max_samples:
+        draws += 1
+        full_board = board + rng.sample(live, needed)
+        board_mask = to_mask(full_board)
+        matchups = []
+        for _ in range(min(matchups_per_board, max_samples - samples)):
+            used = board_mask
+            matchup = []
+            for combos, table in samplers:
+                first, second = combo = combos[table.sample(rng)]
+                bits = (1 << first) | (1 << second)
+                if used & bits:
+                    break
+                used |= bits
+                matchup.append(combo)
+            else:
+                matchups.append(matchup)
+        if matchups:
+            distinct = list({combo for matchup in matchups for combo in matchup})
+            scores = dict(zip(distinct, evaluator.evaluate_shared(distinct, full_board)))
+            board_shares = [0.0] * count
+            for matchup in matchups:
+                strengths = [scores[combo] for combo in matchup]
+                best = max(strengths)
+                winners = [i for i, strength in enumerate(strengths) if strength == best]
+                share = 1 / len(winners)
+                for i in winners:
+                    if len(winners) == 1:
+                        wins[i] += 1
+                    else:
+                        ties[i] += 1
+                    board_shares[i] += share
+                    share_squares[i] += share * share
+            played = len(matchups)
+            for i, board_share in enumerate(board_shares):
+                shares[i] += board_share
+                board_squares[i] += board_share * board_share
+                board_products[i] += board_share * played
+            matchup_squares += played * played
+            samples += played
+            boards += 1
+        if samples >= min_samples and boards > 1 and result().half_width() <= precision:
+            break
+    if not samples:
+        raise ValueError("The ranges have no matchups that fit together.")
+    return result()
@@ -0,0 +1,87 @@
+"""
+Memoized hand ranking
+
+A hand's strength does not depend on which suit is which, so hands that are
+the same up to relabelling suits share one cache entry. The canonical key is
+the hand's four 13-bit suit rank masks sorted in descending order and packed
+into one 52-bit integer. Entries are kept in least-recently-used order and
+the oldest is evicted once the cache holds maxsize hands.
+"""
+
+from collections import OrderedDict
+
+import src.game.evaluator as evaluator
+
+DEFAULT_MAXSIZE = 1 << 16
+
+def canonical_mask(mask):
+    """Returns the suit-normalized form of a 52-bit card mask."""
+    first, second, third, fourth = sorted((mask & 0x1FFF, (mask >> 13) & 0x1FFF,
+                                           (mask >> 26) & 0x1FFF, mask >> 39), reverse=True)
+    return first | second << 13 | third << 26 | fourth << 39
+
+class RankingCache:
+    """Bounded LRU cache of hand strengths keyed by canonical card mask.
+
+    hits, misses and evictions count lookups since creation (or clear()).
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        """Creates an empty cache holding at most maxsize hands."""
+        if maxsize < 1:
+            raise ValueError("The cache must hold at least one hand.")
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def evaluate_mask(self, mask):
+        """Returns the strength of the hand in a 52-bit mask, as evaluator.evaluate_mask."""
+        key = canonical_mask(mask)
+        entries = self.entries
+        strength = entries.get(key)
+        if strength is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return strength
+        self.misses += 1
+        strength = entries[key] = evaluator.evaluate_mask(key)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return strength
+
+    def evaluate(self, codes):
+        """Returns the strength of up to 7 card codes, as evaluator.evaluate."""
+        mask = 0
+        for code in codes:
+            mask |= 1 << code
+        return self.evaluate_mask(mask)
+
+    def evaluate_cards(self, cards):
+        """Returns the strength of up to 7 Card objects, as evaluator.evaluate_cards."""
+        mask = 0
+        for card in cards:
+            mask |= 1 << card.code
+        return self.evaluate_mask(mask)
+
+    def stats(self):
+        """Returns the counters, current size and hit rate as a dict."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Empties the cache and resets the counters."""
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
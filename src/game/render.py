@@ -0,0 +1,108 @@
+"""
+Render caching and dirty-rectangle redraw for the pygame client
+
+Fonts, text and buttons are rendered once and reused. A Renderer keeps the
+surfaces drawn last frame, keyed by what they show, and at the end of each
+frame repaints and updates only the screen areas whose surfaces appeared,
+moved, changed or disappeared. A frame in which nothing changed costs no
+blitting and no display update.
+"""
+
+from functools import lru_cache
+
+import pygame
+
+BUTTON_COLOR = (0, 0, 0)
+TEXT_COLOR = (255, 255, 255)
+BUTTON_FONT_SIZE = 36
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    """Returns the default font at size, loading it only once."""
+    return pygame.font.Font(None, size)
+
+@lru_cache(maxsize=512)
+def text_surface(text, size=20, color=TEXT_COLOR):
+    """Returns text rendered in the default font, reusing earlier renders."""
+    return get_font(size).render(text, True, color)
+
+@lru_cache(maxsize=64)
+def button_surface(text, width, height):
+    """Returns a button of the given size with centered text, rendered once."""
+    surface = pygame.Surface((width, height))
+    surface.fill(BUTTON_COLOR)
+    label = text_surface(text, BUTTON_FONT_SIZE)
+    surface.blit(label, label.get_rect(center=surface.get_rect().center))
+    return surface
+
+class Renderer:
+    """Draws a frame of keyed surfaces over a background, updating only dirty rectangles.
+
+    Each frame, call blit() for everything visible, then end_frame(). A
+    surface counts as unchanged when the same surface object is drawn at the
+    same position under the same key, so pass cached surfaces.
+    """
+
+    def __init__(self, screen, background):
+        """Creates a renderer that repaints the whole screen on its first frame."""
+        self.screen = screen
+        self.background = background
+        self.previous = {}  # key: (surface, rect) drawn last frame
+        self.current = {}
+        self.full_redraw = True
+
+    def set_background(self, background):
+        """Replaces the background and repaints everything next frame."""
+        self.background = background
+        self.invalidate()
+
+    def invalidate(self):
+        """Repaints the whole screen next frame, e.g. after the window was exposed."""
+        self.full_redraw = True
+
+    def blit(self, key, surface, position):
+        """Draws surface with its top left at position this frame."""
+        self.current[key] = (surface, surface.get_rect(topleft=position))
+
+    def end_frame(self):
+        """Repaints and updates the areas that changed since the last frame.
+
+        Returns the list of rectangles updated.
+        """
+        current, previous = self.current, self.previous
+        screen = self.screen
+        if self.full_redraw:
+            screen.blit(self.background, (0, 0))
+            for surface, rect in current.values():
+                screen.blit(surface, rect)
+            pygame.display.flip()
+            dirty = [screen.get_rect()]
+            self.full_redraw = False
+        else:
+            dirty = []
+            for key, (surface, rect) in current.items():
+                old = previous.get(key)
+                if old is None or old[0] is not surface or old[1] != rect:
+                    dirty.append(rect)
+                    if old is not None:
+                        dirty.append(old[1])
+            for key, (_, rect) in previous.items():
+                if key not in current:
+                    dirty.append(rect)
+            if dirty:
+                self._repaint(dirty)
+                pygame.display.update(dirty)
+        self.previous, self.current = current, {}
+        return dirty
+
+    def _repaint(self, dirty):
+        """Redraws the background and every overlapping surface inside each dirty rectangle."""
+        screen = self.screen
+        items = list(self.current.values())
+        for area in dirty:
+            screen.set_clip(area)
+            screen.blit(self.background, area, area)
+            for surface, rect in items:
+                if rect.colliderect(area):
+                    screen.blit(surface, rect)
+        screen.set_clip(None)
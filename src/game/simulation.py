@@ -0,0 +1,125 @@
+"""
+Multiprocess self-play simulation
+
+Splits a run of many hands into chunks that are played by HeadlessGame
+tables in a ProcessPoolExecutor. Every chunk has its own seeded deck and
+agents, and chunk results are streamed back and merged as they finish, so
+memory use does not grow with the length of the run.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import copy
+import os
+import random
+
+from src.constants import HANDS
+from src.game.engine import HeadlessGame
+import src.game.evaluator as evaluator
+
+class SimulationStats:
+    """Per-seat chip results, wins and showdown hand categories over many hands."""
+
+    def __init__(self, seats):
+        """Creates empty totals for a table of the given size."""
+        self.hands = 0
+        self.showdowns = 0
+        self.chips = [0] * seats
+        self.wins = [0.0] * seats  # Split pots count fractionally
+        self.categories = {category: 0 for category in HANDS}
+
+    def record(self, game):
+        """Adds the result of the hand the game just finished."""
+        self.hands += 1
+        for seat, result in enumerate(game.net_results()):
+            self.chips[seat] += result
+        for seat in game.winners:
+            self.wins[seat] += 1 / len(game.winners)
+        if game.winning_strength:
+            self.showdowns += 1
+            self.categories[evaluator.category(game.winning_strength)] += 1
+
+    def merge(self, other):
+        """Adds another set of totals (e.g. a finished chunk) into this one."""
+        self.hands += other.hands
+        self.showdowns += other.showdowns
+        self.chips = [a + b for a, b in zip(self.chips, other.chips)]
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        for category, count in other.categories.items():
+            self.categories[category] += count
+        return self
+
+    def win_rates(self):
+        """Returns the share of hands won by each seat."""
+        return [w / self.hands if self.hands else 0.0 for w in self.wins]
+
+    def chips_per_hand(self):
+        """Returns each seat's average chip result per hand."""
+        return [c / self.hands if self.hands else 0.0 for c in self.chips]
+
+    def category_frequencies(self):
+        """Returns how often each HANDS category won at showdown."""
+        return {HANDS[c]: n / self.showdowns if self.showdowns else 0.0
+                for c, n in self.categories.items()}
+
+    def __str__(self):
+        """Returns a summary of the totals."""
+        lines = [f"{self.hands} hands, {self.showdowns} showdowns"]
+        for seat, (chips, rate) in enumerate(zip(self.chips_per_hand(), self.win_rates())):
+            lines.append(f"Seat {seat + 1}: {chips:+.2f} chips/hand, wins {rate:.2%}")
+        for name, frequency in self.category_frequencies().items():
+            lines.append(f"{name}: {frequency:.2%}")
+        return '\n'.join(lines)
+
+def play_chunk(agents, stacks, num_hands, seed, game_options):
+    """Plays num_hands hands at a fresh table and returns their SimulationStats.
+
+    Stacks are reset before every hand, so each hand is played at the
+    starting stacks and results are independent of earlier hands.
+    """
+    agents = copy.deepcopy(agents)  # Keep agent state (e.g. RNGs) local to the chunk
+    for i, agent in enumerate(agents):
+        if hasattr(agent, 'rng'):
+            agent.rng = random.Random(f"{seed}-agent-{i}")
+    game = HeadlessGame(list(stacks), agents=agents, rng=random.Random(f"{seed}-deck"), **game_options)
+    stats = SimulationStats(len(stacks))
+    for _ in range(num_hands):
+        for player, chips in zip(game.players, stacks):
+            player.chips = chips
+        game.play_hand()
+        stats.record(game)
+    return stats
+
+def iter_chunks(agents, num_hands, stacks=None, chunk_size=10000, workers=None, seed=0, **game_options):
+    """Plays num_hands hands across worker processes and yields the
+    SimulationStats of each chunk as it completes.
+
+    agents (one per seat) must be picklable; game_options are passed on to
+    HeadlessGame (blind and ante amounts). Chunk i is seeded from (seed, i),
+    so a run is reproducible however the chunks are scheduled.
+    """
+    stacks = stacks if stacks is not None else [1000] * len(agents)
+    workers = workers or os.cpu_count() or 1
+    chunks = [(i, min(chunk_size, num_hands - start)) for i, start in enumerate(range(0, num_hands, chunk_size))]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for index, size in chunks:
+            # Bound the queue so finished chunks are consumed as we go
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(play_chunk, agents, stacks, size, f"{seed}-{index}", game_options))
+        for future in pending:
+            yield future.result()
+
+def simulate(agents, num_hands, stacks=None, chunk_size=10000, workers=None, seed=0,
+             on_chunk=None, **game_options):
+    """Plays num_hands hands across worker processes and returns the merged
+    SimulationStats. on_chunk, if given, is called with the running totals
+    after each chunk is merged."""
+    total = SimulationStats(len(agents))
+    for chunk in iter_chunks(agents, num_hands, stacks, chunk_size, workers, seed, **game_options):
+        total.merge(chunk)
+        if on_chunk is not None:
+            on_chunk(total)
+    return total
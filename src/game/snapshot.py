@@ -0,0 +1,93 @@
+"""
+Snapshots of game state
+
+A snapshot stores a Game's (or HeadlessGame's) state as card-code bytes and
+tuples of numbers, so taking one copies no Player or Card objects and
+restoring one just reassigns attributes and looks up the interned cards.
+That makes it cheap enough for tree search, and together with a seeded deck
+it lets a hand be replayed exactly.
+"""
+
+from src.game.card import CARDS
+from src.game.pot import Pot
+
+# HeadlessGame attributes captured on top of the common Game state
+_ENGINE_FIELDS = ('phase', 'small_blind_seat', 'big_blind_seat', 'hands_played', 'winning_strength')
+
+class GameSnapshot:
+    """Immutable-by-convention copy of a game's state."""
+
+    __slots__ = ('deck', 'position', 'community_cards', 'pot', 'side_pots', 'contributions',
+                 'current_highest_bet', 'small_blind_index', 'players', 'engine', 'rng_state')
+
+def _codes(cards):
+    """Packs cards into bytes of card codes."""
+    return bytes(card.code for card in cards)
+
+def _cards(codes):
+    """Unpacks bytes of card codes into the interned cards."""
+    return [CARDS[code] for code in codes]
+
+def _rng_state(rng):
+    """Returns the state of a random.Random (or the random module) or a numpy Generator."""
+    if hasattr(rng, 'getstate'):
+        return rng.getstate()
+    return rng.bit_generator.state
+
+def _set_rng_state(rng, state):
+    """Restores a state returned by _rng_state."""
+    if hasattr(rng, 'setstate'):
+        rng.setstate(state)
+    else:
+        rng.bit_generator.state = state
+
+def take_snapshot(game, include_rng=False):
+    """Returns a GameSnapshot of game.
+
+    With include_rng, the deck's RNG state is saved too, so shuffles after a
+    restore repeat the ones after the snapshot.
+    """
+    snap = GameSnapshot()
+    snap.deck = _codes(game.deck.cards)
+    snap.position = game.deck.position
+    snap.community_cards = _codes(game.community_cards)
+    snap.pot = game.pot
+    snap.side_pots = tuple((pot.amount, tuple(pot.eligible)) for pot in game.side_pots)
+    snap.contributions = tuple(game.contributions)
+    snap.current_highest_bet = game.current_highest_bet
+    snap.small_blind_index = game.small_blind_index
+    snap.players = tuple((_codes(p.hand), p.chips, p.current_bet, p.is_active) for p in game.players)
+    if hasattr(game, 'to_act'):
+        snap.engine = (tuple(getattr(game, name) for name in _ENGINE_FIELDS),
+                       tuple(game.to_act), tuple(game.starting_chips), tuple(game.payouts),
+                       tuple(game.winners))
+    else:
+        snap.engine = None
+    snap.rng_state = _rng_state(game.deck.rng) if include_rng else None
+    return snap
+
+def restore_snapshot(game, snap):
+    """Puts game back into the state captured by snap."""
+    game.deck.cards[:] = _cards(snap.deck)
+    game.deck.position = snap.position
+    game.community_cards = _cards(snap.community_cards)
+    game.pot = snap.pot
+    game.side_pots = [Pot(amount, list(eligible)) for amount, eligible in snap.side_pots]
+    game.contributions = list(snap.contributions)
+    game.current_highest_bet = snap.current_highest_bet
+    game.small_blind_index = snap.small_blind_index
+    for player, (hand, chips, current_bet, is_active) in zip(game.players, snap.players):
+        player.hand = _cards(hand)
+        player.chips = chips
+        player.current_bet = current_bet
+        player.is_active = is_active
+    if snap.engine is not None:
+        fields, to_act, starting_chips, payouts, winners = snap.engine
+        for name, value in zip(_ENGINE_FIELDS, fields):
+            setattr(game, name, value)
+        game.to_act = list(to_act)
+        game.starting_chips = list(starting_chips)
+        game.payouts = list(payouts)
+        game.winners = list(winners)
+    if snap.rng_state is not None:
+        _set_rng_state(game.deck.rng, snap.rng_state)
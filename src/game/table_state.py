@@ -0,0 +1,112 @@
+"""
+Struct-of-arrays state for many tables
+
+Holds chips, current bets, active flags and hole cards for thousands of
+tables in preallocated NumPy arrays, and applies the betting rules of
+src.game.player (bet, call, check, all_in, fold) to many seats at once.
+Each batched operation takes parallel arrays of table and seat indexes,
+which must name distinct (table, seat) pairs.
+"""
+
+import numpy as np
+
+NO_CARD = -1
+
+class TableState:
+    """Player state for num_tables tables of seats players each."""
+
+    def __init__(self, num_tables, seats, chips=1000):
+        """Allocates every table with the given starting chips per seat."""
+        self.num_tables = num_tables
+        self.seats = seats
+        self.chips = np.full((num_tables, seats), chips, dtype=np.int64)
+        self.current_bets = np.zeros((num_tables, seats), dtype=np.int64)
+        self.active = np.ones((num_tables, seats), dtype=bool)
+        self.hands = np.full((num_tables, seats, 2), NO_CARD, dtype=np.int8)  # Card codes
+        self.pots = np.zeros(num_tables, dtype=np.int64)
+        self.current_highest_bet = np.zeros(num_tables, dtype=np.int64)
+
+    def _highest(self, tables, current_highest_bet):
+        """Returns the highest bet per row, from the argument or the tables' own."""
+        if current_highest_bet is None:
+            return self.current_highest_bet[tables]
+        return np.broadcast_to(np.asarray(current_highest_bet, dtype=np.int64), tables.shape)
+
+    def bet(self, tables, seats, amounts, current_highest_bet=None):
+        """Places bets or raises, like Player.bet, and returns the chips committed.
+
+        A seat with no more than the amount goes all-in. Raises ValueError,
+        changing nothing, if any other bet is below twice the current highest
+        bet.
+        """
+        tables, seats = np.asarray(tables), np.asarray(seats)
+        amounts = np.broadcast_to(np.asarray(amounts, dtype=np.int64), tables.shape)
+        highest = self._highest(tables, current_highest_bet)
+        chips = self.chips[tables, seats]
+        all_in = chips <= amounts
+        minimum = np.where(highest > 0, 2 * highest, amounts)
+        too_small = ~all_in & (amounts < minimum)
+        if too_small.any():
+            raise ValueError(f"Bet must be at least twice the current highest bet "
+                             f"({np.count_nonzero(too_small)} bets too small).")
+        committed = np.where(all_in, chips, amounts)
+        self.chips[tables, seats] = chips - committed
+        self.current_bets[tables, seats] += committed
+        return committed
+
+    def call(self, tables, seats, current_highest_bet=None):
+        """Matches the highest bet, like Player.call, going all-in when short,
+        and returns the chips committed."""
+        tables, seats = np.asarray(tables), np.asarray(seats)
+        highest = self._highest(tables, current_highest_bet)
+        chips = self.chips[tables, seats]
+        current = self.current_bets[tables, seats]
+        committed = np.where(chips + current < highest, chips, np.maximum(highest - current, 0))
+        self.chips[tables, seats] = chips - committed
+        self.current_bets[tables, seats] = current + committed
+        return committed
+
+    def check(self, tables, seats, current_highest_bet=None):
+        """Checks, like Player.check; raises ValueError if any seat faces a bet."""
+        tables, seats = np.asarray(tables), np.asarray(seats)
+        facing_bet = self.current_bets[tables, seats] < self._highest(tables, current_highest_bet)
+        if facing_bet.any():
+            raise ValueError(f"Cannot check, there is an active bet ({np.count_nonzero(facing_bet)} seats).")
+        return np.zeros(tables.shape, dtype=np.int64)
+
+    def all_in(self, tables, seats):
+        """Bets every remaining chip, like Player.all_in, and returns the chips committed."""
+        tables, seats = np.asarray(tables), np.asarray(seats)
+        committed = self.chips[tables, seats].copy()
+        self.chips[tables, seats] = 0
+        self.current_bets[tables, seats] += committed
+        return committed
+
+    def fold(self, tables, seats):
+        """Discards the seats' cards and marks them out of the hand, like Player.fold."""
+        self.hands[tables, seats] = NO_CARD
+        self.active[tables, seats] = False
+
+    def commit(self, tables, committed):
+        """Adds chips returned by the betting operations to the tables' pots."""
+        tables = np.asarray(tables)
+        np.add.at(self.pots, tables, committed)
+
+    def raise_highest(self, tables, seats):
+        """Lifts each table's current highest bet to the given seats' current bets."""
+        tables, seats = np.asarray(tables), np.asarray(seats)
+        np.maximum.at(self.current_highest_bet, tables, self.current_bets[tables, seats])
+
+    def deal(self, tables, seats, codes):
+        """Gives seats their two hole cards; codes has shape (len(seats), 2)."""
+        self.hands[tables, seats] = codes
+
+    def new_hand(self, tables=None):
+        """Clears bets, pots, cards and folds at the given (default all) tables;
+        seats with no chips left stay out."""
+        tables = slice(None) if tables is None else np.asarray(tables)
+        self.current_bets[tables] = 0
+        self.pots[tables] = 0
+        self.current_highest_bet[tables] = 0
+        self.hands[tables] = NO_CARD
+        self.active[tables] = self.chips[tables] > 0
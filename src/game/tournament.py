@@ -0,0 +1,179 @@
+"""
+Tournament simulation
+
+Runs a freezeout tournament over several HeadlessGame tables played by
+agents. Blinds and antes follow a schedule of levels, busted players are
+eliminated and given their finishing place, and tables are broken and
+balanced as the field shrinks until one final table is left.
+"""
+
+import math
+import random
+
+from src.game.engine import HeadlessGame
+from src.game.icm import icm_equity
+from src.game.player import Player
+
+class BlindLevel:
+    """Forced bets for a number of rounds (one hand at every table per round)."""
+
+    __slots__ = ('small_blind', 'big_blind', 'ante', 'rounds')
+
+    def __init__(self, small_blind, big_blind, ante=0, rounds=10):
+        """Creates a level; rounds is how long it lasts."""
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.ante = ante
+        self.rounds = rounds
+
+    def __repr__(self):
+        return f"BlindLevel({self.small_blind}, {self.big_blind}, {self.ante}, {self.rounds})"
+
+DEFAULT_SCHEDULE = (
+    BlindLevel(10, 20),
+    BlindLevel(15, 30),
+    BlindLevel(25, 50),
+    BlindLevel(50, 100, 10),
+    BlindLevel(75, 150, 15),
+    BlindLevel(100, 200, 25),
+    BlindLevel(150, 300, 25),
+    BlindLevel(200, 400, 50),
+    BlindLevel(300, 600, 75),
+    BlindLevel(500, 1000, 100),
+)
+
+class Tournament:
+    """A freezeout tournament between agents.
+
+    agents holds one agent per entrant (see src.game.agents). The last level
+    of the schedule repeats until the tournament ends. payouts lists the
+    prize for 1st, 2nd, ... place. Nobody is ever left alone at a table,
+    so with two-seat tables an odd player out joins one of them.
+    """
+
+    def __init__(self, agents, stack=1000, seats_per_table=9, schedule=DEFAULT_SCHEDULE,
+                 payouts=(50, 30, 20), rng=None):
+        """Seats every entrant at randomly drawn tables of at most seats_per_table."""
+        if len(agents) < 2:
+            raise ValueError("A tournament needs at least two entrants.")
+        if seats_per_table < 2:
+            raise ValueError("Tables need at least two seats.")
+        self.rng = rng if rng is not None else random.Random()
+        self.agents = list(agents)
+        self.players = [Player(i + 1, stack) for i in range(len(agents))]
+        self.seats_per_table = seats_per_table
+        self.schedule = list(schedule)
+        self.payouts = list(payouts)
+        self.level_index = 0
+        self.rounds_in_level = 0
+        self.rounds_played = 0
+        self.finishing_order = []  # Player numbers, first eliminated first
+
+        seating = self.players[:]
+        self.rng.shuffle(seating)
+        table_count = self._table_count(len(seating))
+        self.tables = [self._new_table(seating[i::table_count]) for i in range(table_count)]
+
+    @property
+    def level(self):
+        """The BlindLevel currently in force."""
+        return self.schedule[min(self.level_index, len(self.schedule) - 1)]
+
+    @property
+    def remaining(self):
+        """Players still holding chips."""
+        return [player for table in self.tables for player in table.players]
+
+    def is_over(self):
+        """Returns True once only one player is left."""
+        return len(self.remaining) <= 1
+
+    def _table_count(self, players):
+        """Returns how many tables seat players with nobody left alone at one."""
+        return max(1, min(math.ceil(players / self.seats_per_table), players // 2))
+
+    def _new_table(self, players):
+        """Creates a table for the given Player objects at the current level."""
+        level = self.level
+        return HeadlessGame(players, small_blind_amount=level.small_blind,
+                            big_blind_amount=level.big_blind, ante_amount=level.ante,
+                            rng=random.Random(self.rng.random()))
+
+    def play_round(self):
+        """Plays one hand at every table, then eliminates busted players,
+        balances the tables and moves the blind level on when it is due."""
+        level = self.level
+        for table in self.tables:
+            table.small_blind_amount = level.small_blind
+            table.big_blind_amount = level.big_blind
+            table.ante_amount = level.ante
+            table.play_hand([self.agents[player.num - 1] for player in table.players])
+        self._eliminate()
+        self._balance()
+
+        self.rounds_played += 1
+        self.rounds_in_level += 1
+        if self.rounds_in_level >= level.rounds and self.level_index < len(self.schedule) - 1:
+            self.level_index += 1
+            self.rounds_in_level = 0
+
+    def _eliminate(self):
+        """Removes players with no chips; among players busting in the same
+        round, whoever started the hand with more chips finishes higher."""
+        busted = []
+        for table in self.tables:
+            for player, start in zip(table.players, table.starting_chips):
+                if player.chips == 0:
+                    busted.append((start, player))
+            if busted:
+                table.players = [player for player in table.players if player.chips > 0]
+        busted.sort(key=lambda item: item[0])
+        self.finishing_order.extend(player.num for _, player in busted)
+        self.tables = [table for table in self.tables if table.players]
+
+    def _balance(self):
+        """Breaks tables that are no longer needed and evens out table sizes."""
+        players = sum(len(table.players) for table in self.tables)
+        if players <= 1:
+            return
+        needed = self._table_count(players)
+        moved = []
+        while len(self.tables) > needed:
+            smallest = min(self.tables, key=lambda table: len(table.players))
+            self.tables.remove(smallest)
+            moved.extend(smallest.players)
+        for player in moved:
+            min(self.tables, key=lambda table: len(table.players)).players.append(player)
+        while True:
+            smallest = min(self.tables, key=lambda table: len(table.players))
+            largest = max(self.tables, key=lambda table: len(table.players))
+            if len(largest.players) - len(smallest.players) <= 1:
+                break
+            smallest.players.append(largest.players.pop(self.rng.randrange(len(largest.players))))
+        for table in self.tables:
+            table.small_blind_index %= len(table.players)
+
+    def play(self, max_rounds=100000):
+        """Plays until one player is left (or max_rounds) and returns the
+        player numbers in finishing order, winner first."""
+        while not self.is_over() and self.rounds_played < max_rounds:
+            self.play_round()
+        return self.standings()
+
+    def standings(self):
+        """Returns player numbers by place: players still in, biggest stack
+        first, then eliminated players, last eliminated first."""
+        alive = sorted(self.remaining, key=lambda player: player.chips, reverse=True)
+        return [player.num for player in alive] + self.finishing_order[::-1]
+
+    def prizes(self):
+        """Returns {player number: prize}, paying remaining players by ICM
+        on their stacks if the tournament is not over."""
+        alive = self.remaining
+        prizes = {}
+        places = self.finishing_order[::-1]
+        for place, number in enumerate(places, start=len(alive)):
+            prizes[number] = self.payouts[place] if place < len(self.payouts) else 0
+        for player, equity in zip(alive, icm_equity([p.chips for p in alive], self.payouts)):
+            prizes[player.num] = equity
+        return prizes
@@ -3,8 +3,7 @@ Utility functions for poker game
 """
 
 from src.constants import RANK_TO_FACE
-
-import pygame
+import src.game.render as render
 
 def print_hand_info(rank, hand):
     """Prints the info for a hand."""
@@ -38,17 +37,10 @@ def draw_card(screen, card_images, card_key, position):
     screen.blit(card_image, position)
 
 def draw_text(screen, text, position, size=20, color=(255, 255, 255)):
-    font = pygame.font.Font(None, size)
-    text_surface = font.render(text, True, color)
+    text_surface = render.text_surface(text, size, color)
     screen.blit(text_surface, position)
 
 def draw_button(screen, text, position, width, height):
-    font = pygame.font.Font(None, 36)
-    button_color = (0, 0, 0)  # Example color
-    text_color = (255, 255, 255)
-    rect = pygame.Rect(position[0], position[1], width, height)
-    pygame.draw.rect(screen, button_color, rect)
-    text_surf = font.render(text, True, text_color)
-    text_rect = text_surf.get_rect(center=rect.center)
-    screen.blit(text_surf, text_rect)
+    button = render.button_surface(text, width, height)
+    rect = screen.blit(button, position)
     return rect  # Returning the rectangle can help in detecting clicks later
@@ -4,13 +4,15 @@ Main file for running poker game GUI
 """
 
 import src.constants as constants
+import src.game.assets as assets
 from src.game.deck import Deck
 from src.game.game import Game
 from src.game.inputbox import InputBox
+from src.game.instrumentation import from_environment, phase_timer
 from src.game.player import Player
+from src.game.render import Renderer, button_surface
 import src.game.utilities as utilities
 
-import os
 import pygame
 import sys
 
@@ -20,36 +22,16 @@ screen = pygame.display.set_mode((constants.SCREEN_WIDTH, constants.SCREEN_HEIGH
 pygame.display.set_caption("Texas Hold'em")
 clock = pygame.time.Clock()
 
-def load_card_images():
-    card_images = {}
-    ranks = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
-    suits = ['h', 'd', 'c', 's']
-    base_path = os.path.join(constants.CARD_IMAGES_DIR)
-    
-    for rank in ranks:
-        for suit in suits:
-            filename = f"{rank}{suit}.png"
-            path = os.path.join(base_path, filename)
-            card_key = f"{rank}{suit}"
-            card_images[card_key] = pygame.image.load(path).convert_alpha()
-    return card_images
-
-def load_background():
-    base_path = os.path.join("./src/resources/")
-    bg_path = os.path.join(base_path, "table.png")
-    table_bg = pygame.image.load(bg_path).convert()
-    table_bg = pygame.transform.scale(table_bg, (constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
-    return table_bg
-
-card_images = load_card_images()
-table = load_background()
+card_images = assets.card_images  # Sliced from the cached atlas as cards are first drawn
+table = assets.backgrounds.get((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
 
 players = [
     Player(1, 1000, (50, 650), screen),
     Player(2, 1000, (50, 50), screen),
     # Add more players as needed
 ]
-game = Game(players)
+instruments = from_environment()  # None unless HOLDEM_INSTRUMENTS is set
+game = Game(players, instruments=instruments)
 current_player_index = 0
 
 button_fold = utilities.draw_button(screen, "Fold", (850, 700), 100, 50)
@@ -57,6 +39,8 @@ button_check = utilities.draw_button(screen, "Check", (750, 700), 100, 50)
 button_call = utilities.draw_button(screen, "Call", (650, 700), 100, 50)
 button_bet = utilities.draw_button(screen, "Bet", (550, 700), 100, 50)
 bet_input_box = InputBox(400, 700, 140, 32)
+renderer = Renderer(screen, table)
+buttons = [("Fold", (850, 700)), ("Check", (750, 700)), ("Call", (650, 700)), ("Bet", (550, 700))]
 
 def handle_buttons():
     """Handle button presses and update game state accordingly."""
@@ -96,28 +80,38 @@ def next_player():
 def game_loop():
     running = True
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+        with phase_timer(instruments, 'frame.events'):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    renderer.invalidate()  # The window contents were lost
 
-            # Properly handle text input for the bet amount
-            bet_input_box.handle_event(event)
+                # Properly handle text input for the bet amount
+                bet_input_box.handle_event(event)
 
-            # Correctly detect mouse clicks on buttons
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # 1 is the left mouse button
-                handle_buttons()
+                # Correctly detect mouse clicks on buttons
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # 1 is the left mouse button
+                    handle_buttons()
 
-        screen.blit(table, (0, 0))  # Draw the background table
-        for player in players:
-            player.draw(card_images)  # Draw each player's cards and information
-        bet_input_box.draw(screen)  # Draw the betting input box
-        utilities.draw_button(screen, "Fold", (850, 700), 100, 50)  # Redraw buttons
-        utilities.draw_button(screen, "Check", (750, 700), 100, 50)
-        utilities.draw_button(screen, "Call", (650, 700), 100, 50)
-        utilities.draw_button(screen, "Bet", (550, 700), 100, 50)
-        pygame.display.flip()
-        clock.tick(constants.FPS)
+        with phase_timer(instruments, 'frame.draw'):
+            # Only what changed since the last frame is repainted over the table
+            for player in players:
+                x, y = player.pos
+                for idx, card in enumerate(player.hand):
+                    renderer.blit(('card', player.num, idx), card_images[card.get_key()],
+                                  (x + idx * (constants.CARD_WIDTH + 5), y))
+            renderer.blit('bet_input', bet_input_box.get_surface(), bet_input_box.rect.topleft)
+            for text, position in buttons:
+                renderer.blit(('button', text), button_surface(text, 100, 50), position)
+        with phase_timer(instruments, 'frame.update'):
+            renderer.end_frame()
+        with phase_timer(instruments, 'frame.wait'):
+            clock.tick(constants.FPS)
+        if instruments is not None:
+            instruments.count('frames')
+            instruments.maybe_dump()
 
 if __name__ == "__main__":
     game_loop()
\ No newline at end of file
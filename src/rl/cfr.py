@@ -0,0 +1,443 @@
+"""
+Monte Carlo counterfactual regret minimization for heads-up play
+
+Solves an abstraction of heads-up no-limit hold'em with external-sampling
+MCCFR. The betting abstraction uses the discrete actions of src.rl.env
+(fold, check/call, minimum bet, pot-sized bet, all-in) with the amounts
+HeadlessGame accepts: a bet adds at least twice the current highest bet, or
+the big blind when the street is unopened. Cards are abstracted into hand
+strength buckets per street.
+
+The betting tree is built once into flat NumPy arrays, and regrets and
+strategy sums are float32 arrays with one row per (decision node, bucket).
+Iterations run in worker processes whose regret and strategy increments are
+merged into the master tables after every round, and the tables can be
+saved to and trained in place from memory-mapped .npy checkpoints.
+
+Run ``python -m src.rl.cfr --iterations 100000 --checkpoint cfr/`` to train.
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import random
+
+import numpy as np
+
+import src.game.evaluator as evaluator
+from src.game.preflop import hand_strength
+from src.rl.env import ALL_IN, BET_MIN, BET_POT, CHECK_CALL, FOLD, NUM_ACTIONS
+
+# Node kinds
+DECISION, FOLDED, SHOWDOWN = range(3)
+
+SMALL_BLIND_POSITION, BIG_BLIND_POSITION = 0, 1
+NUM_STREETS = 4
+_BOARD_SIZES = (0, 3, 4, 5)
+
+_STATE_FILES = ('regrets.npy', 'strategy_sums.npy')
+_META_FILE = 'meta.json'
+
+class BettingTree:
+    """Every abstract betting state of a heads-up hand, as flat arrays.
+
+    Position 0 is the small blind, who acts first preflop; the big blind
+    acts first after the flop, as in HeadlessGame. Sequences of actions that
+    reach the same state (street, chips committed, bets on the street and
+    player to act) share one node, so the tree is really a DAG and a node can
+    be found again from what a Decision shows. Bets at least double each
+    time, which keeps every street short without a cap on raises.
+    """
+
+    def __init__(self, stack=1000, small_blind=10, big_blind=20):
+        """Builds the tree for both players starting the hand with stack chips."""
+        self.stack = stack
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        kinds, players, streets, committed, children = [], [], [], [], []
+        self._nodes = (kinds, players, streets, committed, children)
+        self._states = {}
+        self._lookup = {}
+        self._build(0, (small_blind, big_blind), (small_blind, big_blind),
+                    (SMALL_BLIND_POSITION, BIG_BLIND_POSITION))
+        del self._states
+
+        self.kind = np.array(kinds, dtype=np.int8)
+        self.player = np.array(players, dtype=np.int8)  # Folder for FOLDED, -1 for SHOWDOWN
+        self.street = np.array(streets, dtype=np.int8)
+        self.committed = np.array(committed, dtype=np.int32)  # (nodes, 2) chips put in
+        self.children = np.array(children, dtype=np.int32)  # (nodes, NUM_ACTIONS), -1 if illegal
+        self.decision_index = np.full(len(kinds), -1, dtype=np.int32)
+        decisions = np.flatnonzero(self.kind == DECISION)
+        self.decision_index[decisions] = np.arange(len(decisions), dtype=np.int32)
+        self.num_decisions = len(decisions)
+
+        # Python lists for the traversal's hot loop
+        self._kind = kinds
+        self._player = players
+        self._street = streets
+        self._committed = committed
+        self._decision_index = self.decision_index.tolist()
+        self._actions = [[(action, child) for action, child in enumerate(row) if child >= 0]
+                         for row in children]
+
+    def __len__(self):
+        return len(self.kind)
+
+    def _add(self, key, kind, player, street, committed):
+        """Appends a node for a state key and returns its index."""
+        kinds, players, streets, committed_list, children = self._nodes
+        kinds.append(kind)
+        players.append(player)
+        streets.append(street)
+        committed_list.append(list(committed))
+        children.append([-1] * NUM_ACTIONS)
+        node = self._states[key] = len(kinds) - 1
+        return node
+
+    def _build(self, street, bets, committed, to_act):
+        """Returns the node for a betting state, adding it and everything after it if new."""
+        to_act = self._close_if_matched(bets, committed, to_act)
+        while not to_act:
+            if street == NUM_STREETS - 1:
+                key = (SHOWDOWN, committed)
+                node = self._states.get(key)
+                return node if node is not None else self._add(key, SHOWDOWN, -1, street, committed)
+            street += 1
+            bets = (0, 0)
+            to_act = tuple(p for p in (BIG_BLIND_POSITION, SMALL_BLIND_POSITION)
+                           if committed[p] < self.stack)
+            if len(to_act) < 2:
+                to_act = ()
+
+        key = (street, bets, committed, to_act)
+        node = self._states.get(key)
+        if node is not None:
+            return node
+        player = to_act[0]
+        node = self._add(key, DECISION, player, street, committed)
+        highest = max(bets)
+        self._lookup[(street, player, committed, bets[player], highest)] = node
+        to_call = highest - bets[player]
+        chips = self.stack - committed[player]
+        pot = committed[0] + committed[1]
+        children = self._nodes[4][node]
+
+        if to_call > 0:
+            fold_key = (FOLDED, player, committed)
+            fold = self._states.get(fold_key)
+            children[FOLD] = fold if fold is not None else self._add(fold_key, FOLDED, player, street, committed)
+        paid = min(to_call, chips)
+        children[CHECK_CALL] = self._after(street, bets, committed, to_act, player, paid)
+        if chips > to_call and committed[1 - player] < self.stack:
+            min_bet = 2 * highest if highest > 0 else self.big_blind
+            if min_bet < chips:
+                children[BET_MIN] = self._after(street, bets, committed, to_act, player, min_bet)
+            pot_bet = max(min_bet, pot)
+            if min_bet < pot_bet < chips:
+                children[BET_POT] = self._after(street, bets, committed, to_act, player, pot_bet)
+            children[ALL_IN] = self._after(street, bets, committed, to_act, player, chips)
+        return node
+
+    def _after(self, street, bets, committed, to_act, player, amount):
+        """Returns the node reached after player adds amount chips."""
+        highest = max(bets)
+        bets = _added(bets, player, amount)
+        committed = _added(committed, player, amount)
+        opponent = 1 - player
+        if bets[player] > highest:
+            # A bet or raise reopens the action for the opponent
+            to_act = (opponent,) if committed[opponent] < self.stack else ()
+        else:
+            to_act = to_act[1:]
+        return self._build(street, bets, committed, to_act)
+
+    def _close_if_matched(self, bets, committed, to_act):
+        """Ends the street when the only player left to act faces nobody who can
+        still bet and has already matched, as HeadlessGame does."""
+        if len(to_act) == 1:
+            can_bet = sum(committed[p] < self.stack for p in (0, 1))
+            if can_bet == 1 and bets[to_act[0]] >= max(bets):
+                return ()
+        return to_act
+
+    def find(self, street, player, committed, current_bet, current_highest_bet):
+        """Returns the decision node for a betting state, or None if it is off the tree.
+
+        committed is (small blind, big blind) chips put in over the hand;
+        current_bet and current_highest_bet are the street's bets as in a
+        Decision.
+        """
+        return self._lookup.get((street, player, tuple(committed), current_bet, current_highest_bet))
+
+    def amount(self, node, action):
+        """Returns the chips the acting player adds by taking action at node."""
+        child = self.children[node, action]
+        player = self._player[node]
+        return self._committed[child][player] - self._committed[node][player]
+
+def _added(pair, position, amount):
+    """Returns a copy of a per-position pair with amount added for position."""
+    return (pair[0] + amount, pair[1]) if position == 0 else (pair[0], pair[1] + amount)
+
+def strength_bucket(hole, board, buckets, rng, samples=100):
+    """Returns the hand strength bucket (0 to buckets - 1) of hole card codes.
+
+    Preflop this is the hand's percentile from the preflop equity table;
+    after the flop it is the share of sampled opponent hands beaten on the
+    current board, counting ties as half.
+    """
+    if not board:
+        return min(int(hand_strength(hole) * buckets), buckets - 1)
+    dead = set(hole) | set(board)
+    live = [code for code in range(52) if code not in dead]
+    opponents = [rng.sample(live, 2) for _ in range(samples)]
+    scores = evaluator.evaluate_shared([hole] + opponents, board)
+    hero = scores[0]
+    beaten = sum(1.0 if score < hero else 0.5 if score == hero else 0.0 for score in scores[1:])
+    return min(int(beaten / samples * buckets), buckets - 1)
+
+def _regret_matching(regrets):
+    """Returns the strategy proportional to positive regrets (uniform if none)."""
+    positive = [r if r > 0 else 0.0 for r in regrets]
+    total = sum(positive)
+    if total <= 0:
+        return [1.0 / len(regrets)] * len(regrets)
+    return [r / total for r in positive]
+
+class CFRSolver:
+    """External-sampling MCCFR over a BettingTree with hand strength buckets."""
+
+    def __init__(self, tree=None, buckets=8, regrets=None, strategy_sums=None):
+        """Creates a solver with zeroed tables, or around existing ones."""
+        self.tree = tree if tree is not None else BettingTree()
+        self.buckets = buckets
+        rows = self.tree.num_decisions * buckets
+        self.regrets = regrets if regrets is not None else np.zeros((rows, NUM_ACTIONS), dtype=np.float32)
+        self.strategy_sums = (strategy_sums if strategy_sums is not None
+                              else np.zeros((rows, NUM_ACTIONS), dtype=np.float32))
+        self.iterations = 0
+
+    def config(self):
+        """Returns the settings needed to rebuild the solver."""
+        tree = self.tree
+        return {'stack': tree.stack, 'small_blind': tree.small_blind, 'big_blind': tree.big_blind,
+                'buckets': self.buckets}
+
+    @classmethod
+    def from_config(cls, config, regrets=None, strategy_sums=None):
+        """Rebuilds a solver from config()."""
+        tree = BettingTree(config['stack'], config['small_blind'], config['big_blind'])
+        return cls(tree, config['buckets'], regrets, strategy_sums)
+
+    def row(self, node, bucket):
+        """Returns the table row of a decision node and bucket."""
+        return self.tree.decision_index[node] * self.buckets + bucket
+
+    def average_strategy(self, node, bucket):
+        """Returns the average strategy at a decision node as {action: probability}."""
+        actions = [action for action, _ in self.tree._actions[node]]
+        sums = self.strategy_sums[self.row(node, bucket), actions].astype(np.float64)
+        total = sums.sum()
+        probabilities = sums / total if total > 0 else np.full(len(actions), 1.0 / len(actions))
+        return dict(zip(actions, probabilities.tolist()))
+
+    # Training
+
+    def _deal(self, rng):
+        """Deals both hands and a board; returns (buckets per position and street,
+        showdown result for position 0: 1 win, 0 tie, -1 loss)."""
+        codes = rng.sample(range(52), 9)
+        holes = (codes[0:2], codes[2:4])
+        board = codes[4:]
+        buckets = [[strength_bucket(hole, board[:size], self.buckets, rng) for size in _BOARD_SIZES]
+                   for hole in holes]
+        first, second = evaluator.evaluate_shared(holes, board)
+        return buckets, (first > second) - (first < second)
+
+    def iterate(self, rng):
+        """Runs one MCCFR iteration per player on a freshly dealt hand."""
+        buckets, result = self._deal(rng)
+        for traverser in (0, 1):
+            self._traverse(0, traverser, buckets, result, rng)
+        self.iterations += 1
+
+    def _traverse(self, node, traverser, buckets, result, rng):
+        """Returns the traverser's sampled counterfactual value of node, in chips."""
+        tree = self.tree
+        kind = tree._kind[node]
+        committed = tree._committed[node]
+        opponent = 1 - traverser
+        if kind == FOLDED:
+            return -committed[traverser] if tree._player[node] == traverser else committed[opponent]
+        if kind == SHOWDOWN:
+            outcome = result if traverser == 0 else -result
+            if outcome > 0:
+                return committed[opponent]
+            return -committed[traverser] if outcome < 0 else 0.0
+
+        player = tree._player[node]
+        row = tree._decision_index[node] * self.buckets + buckets[player][tree._street[node]]
+        moves = tree._actions[node]
+        actions = [action for action, _ in moves]
+        strategy = _regret_matching(self.regrets[row, actions].tolist())
+
+        if player == traverser:
+            values = [self._traverse(child, traverser, buckets, result, rng) for _, child in moves]
+            node_value = sum(p * v for p, v in zip(strategy, values))
+            self.regrets[row, actions] += np.array(values, dtype=np.float32) - node_value
+            return node_value
+
+        self.strategy_sums[row, actions] += np.array(strategy, dtype=np.float32)
+        pick = rng.random()
+        for (_, child), probability in zip(moves, strategy):
+            pick -= probability
+            if pick <= 0:
+                break
+        return self._traverse(child, traverser, buckets, result, rng)
+
+    def train(self, iterations, workers=None, merge_every=1000, seed=0, checkpoint=None):
+        """Runs iterations of MCCFR, in parallel across workers processes.
+
+        Each round, every worker runs merge_every iterations from the current
+        tables and the increments are summed back in; with workers=1 the
+        iterations run in this process. If checkpoint is a directory, the
+        tables are saved there after every round.
+        """
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(workers) if workers > 1 and iterations > merge_every else None
+        round_number = 0
+        try:
+            while iterations > 0:
+                chunks = [min(merge_every, iterations - i * merge_every) for i in range(workers)]
+                chunks = [chunk for chunk in chunks if chunk > 0]
+                seeds = [f"{seed}-{self.iterations}-{round_number}-{i}" for i in range(len(chunks))]
+                if executor is None or len(chunks) == 1:
+                    rng = random.Random(seeds[0])
+                    for _ in range(chunks[0]):
+                        self.iterate(rng)
+                else:
+                    regrets, strategy_sums = np.asarray(self.regrets), np.asarray(self.strategy_sums)
+                    futures = [executor.submit(_train_chunk, self.config(), regrets, strategy_sums,
+                                               chunk, chunk_seed)
+                               for chunk, chunk_seed in zip(chunks, seeds)]
+                    for future in futures:
+                        regret_delta, strategy_delta = future.result()
+                        self.regrets += regret_delta
+                        self.strategy_sums += strategy_delta
+                    self.iterations += sum(chunks)
+                iterations -= sum(chunks)
+                round_number += 1
+                if checkpoint is not None:
+                    self.save(checkpoint)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    # Checkpoints
+
+    def save(self, path):
+        """Writes the tables to memory-mappable .npy files plus settings in a directory."""
+        os.makedirs(path, exist_ok=True)
+        for name, table in zip(_STATE_FILES, (self.regrets, self.strategy_sums)):
+            file_path = os.path.join(path, name)
+            if isinstance(table, np.memmap) and os.path.abspath(table.filename) == os.path.abspath(file_path):
+                table.flush()  # Already training in place on this checkpoint
+                continue
+            out = np.lib.format.open_memmap(file_path, mode='w+', dtype=np.float32, shape=table.shape)
+            out[:] = table
+            out.flush()
+            del out
+        with open(os.path.join(path, _META_FILE), 'w') as file:
+            json.dump({'config': self.config(), 'iterations': self.iterations}, file)
+
+    @classmethod
+    def load(cls, path, mode='r+'):
+        """Opens a checkpoint with its tables memory-mapped (mode 'r' for
+        read-only use, 'r+' to keep training in place)."""
+        with open(os.path.join(path, _META_FILE)) as file:
+            meta = json.load(file)
+        regrets, strategy_sums = (np.load(os.path.join(path, name), mmap_mode=mode) for name in _STATE_FILES)
+        solver = cls.from_config(meta['config'], regrets, strategy_sums)
+        solver.iterations = meta['iterations']
+        return solver
+
+def _train_chunk(config, regrets, strategy_sums, iterations, seed):
+    """Runs iterations in a worker from copies of the tables and returns the
+    (regret, strategy sum) increments."""
+    solver = CFRSolver.from_config(config, regrets.copy(), strategy_sums.copy())
+    rng = random.Random(seed)
+    for _ in range(iterations):
+        solver.iterate(rng)
+    return solver.regrets - regrets, solver.strategy_sums - strategy_sums
+
+class CFRAgent:
+    """Plays a solver's average strategy at a HeadlessGame table.
+
+    Assumes heads-up play with both players starting each hand with the
+    solver's stack and blinds. States off the abstract tree, such as bets of
+    other sizes, are answered by checking or calling.
+    """
+
+    def __init__(self, solver, rng=None):
+        """Creates an agent sampling from solver's average strategy with rng."""
+        self.solver = solver
+        self.rng = rng if rng is not None else random.Random()
+
+    def __call__(self, decision):
+        """Chooses an action for the decision."""
+        tree = self.solver.tree
+        fallback = 'check' if 'check' in decision.legal_actions else 'call'
+        small_blind_seat = getattr(decision, 'small_blind_seat', None)
+        if small_blind_seat is None:
+            return fallback
+        position = SMALL_BLIND_POSITION if decision.seat == small_blind_seat else BIG_BLIND_POSITION
+        mine = tree.stack - decision.chips
+        theirs = decision.pot - mine
+        committed = (mine, theirs) if position == SMALL_BLIND_POSITION else (theirs, mine)
+        street = _BOARD_SIZES.index(len(decision.community_cards))
+        node = tree.find(street, position, committed, decision.current_bet, decision.current_highest_bet)
+        if node is None:
+            return fallback
+
+        hole = [card.code for card in decision.hand]
+        board = [card.code for card in decision.community_cards]
+        bucket = strength_bucket(hole, board, self.solver.buckets, self.rng)
+        strategy = self.solver.average_strategy(node, bucket)
+        pick = self.rng.random()
+        for action, probability in strategy.items():
+            pick -= probability
+            if pick <= 0:
+                break
+        if action == FOLD:
+            return 'fold'
+        if action == CHECK_CALL:
+            return fallback
+        if action == ALL_IN:
+            return 'all-in'
+        return 'bet', tree.amount(node, action)
+
+def main():
+    """Parses command-line options and trains a solver, resuming a checkpoint if present."""
+    parser = argparse.ArgumentParser(description="Heads-up MCCFR solver")
+    parser.add_argument('--iterations', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--merge-every', type=int, default=1000)
+    parser.add_argument('--buckets', type=int, default=8)
+    parser.add_argument('--stack', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--checkpoint', default='cfr_checkpoint')
+    args = parser.parse_args()
+
+    if os.path.exists(os.path.join(args.checkpoint, _META_FILE)):
+        solver = CFRSolver.load(args.checkpoint)
+    else:
+        solver = CFRSolver(BettingTree(args.stack), args.buckets)
+    print(f"{len(solver.tree)} nodes, {solver.tree.num_decisions} decision nodes, "
+          f"{solver.regrets.nbytes * 2 / 2 ** 20:.1f} MiB of tables")
+    solver.train(args.iterations, args.workers, args.merge_every, args.seed, args.checkpoint)
+    print(f"Trained to {solver.iterations} iterations; saved to {args.checkpoint}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Vectorized poker environment for training agents
+
+Steps K independent HeadlessGame tables in lockstep behind a gym-style
+reset/step API. The learning agent always sits in seat 0; the other seats are
+played by opponent agents. Each episode is one hand, and finished tables are
+reset automatically so every step returns a full batch of observations.
+"""
+
+import random
+
+import numpy as np
+
+from src.game.agents import call_agent
+from src.game.engine import FLOP, PREFLOP, RIVER, TURN, HeadlessGame
+
+# Discrete actions available to the learner
+FOLD, CHECK_CALL, BET_MIN, BET_POT, ALL_IN = range(5)
+NUM_ACTIONS = 5
+
+_STREETS = (PREFLOP, FLOP, TURN, RIVER)
+LEARNER_SEAT = 0
+
+class VectorEnv:
+    """K poker tables stepped together with NumPy observation, action-mask
+    and reward arrays.
+
+    Observations hold the learner's hole cards and the board (52-way one-hot
+    each), the street, and the pot, stacks and bet sizes scaled by the
+    starting stack. Rewards are the learner's chip result for the hand in
+    big blinds, given on the step that ends it.
+    """
+
+    def __init__(self, num_tables, num_players=2, stack=1000, small_blind_amount=10,
+                 big_blind_amount=20, opponents=None, seed=None):
+        """Creates num_tables tables of num_players seats each."""
+        self.num_tables = num_tables
+        self.num_players = num_players
+        self.stack = stack
+        self.big_blind_amount = big_blind_amount
+        self.opponents = opponents if opponents is not None else [call_agent] * (num_players - 1)
+        self.games = [HeadlessGame([stack] * num_players, small_blind_amount=small_blind_amount,
+                                   big_blind_amount=big_blind_amount)
+                      for _ in range(num_tables)]
+        self._seed(seed)
+
+        self.observation_size = 52 + 52 + len(_STREETS) + 5 + (num_players - 1)
+        self.observations = np.zeros((num_tables, self.observation_size), dtype=np.float32)
+        self.action_mask = np.zeros((num_tables, NUM_ACTIONS), dtype=bool)
+        self.rewards = np.zeros(num_tables, dtype=np.float32)
+        self.terminated = np.zeros(num_tables, dtype=bool)
+        self.truncated = np.zeros(num_tables, dtype=bool)
+
+    def _seed(self, seed):
+        """Gives each table its own deck RNG derived from seed."""
+        for i, game in enumerate(self.games):
+            game.deck.rng = random.Random(f"{seed}-{i}") if seed is not None else random.Random()
+
+    def reset(self, seed=None):
+        """Starts a new hand at every table and returns (observations, info)."""
+        if seed is not None:
+            self._seed(seed)
+        for i in range(self.num_tables):
+            self._new_hand(i)
+        return self.observations.copy(), {'action_mask': self.action_mask.copy()}
+
+    def step(self, actions):
+        """Applies one learner action per table.
+
+        Returns (observations, rewards, terminated, truncated, info) like a
+        gymnasium vector environment. Tables whose hand ended are reset, so
+        their observation is already the first decision of the next hand.
+        Raises ValueError if an action is masked out.
+        """
+        actions = np.asarray(actions)
+        self.rewards.fill(0.0)
+        self.terminated.fill(False)
+        for i, action in enumerate(actions.tolist()):
+            if not self.action_mask[i, action]:
+                raise ValueError(f"Action {action} is not legal at table {i}.")
+            game = self.games[i]
+            self._apply(game, action)
+            if self._play_opponents(game):
+                self.rewards[i] = game.net_results()[LEARNER_SEAT] / self.big_blind_amount
+                self.terminated[i] = True
+                self._new_hand(i)
+            else:
+                self._observe(i)
+        info = {'action_mask': self.action_mask.copy()}
+        return (self.observations.copy(), self.rewards.copy(), self.terminated.copy(),
+                self.truncated.copy(), info)
+
+    def _apply(self, game, action):
+        """Translates a discrete learner action into an engine action."""
+        if action == FOLD:
+            game.act('fold')
+        elif action == CHECK_CALL:
+            game.act('check' if 'check' in game.legal_actions(LEARNER_SEAT) else 'call')
+        elif action == BET_MIN:
+            game.act('bet', game.min_bet())
+        elif action == BET_POT:
+            game.act('bet', max(game.min_bet(), game.pot))
+        else:
+            game.act('all-in')
+
+    def _play_opponents(self, game):
+        """Lets opponents act until the learner is due; returns True if the hand ended."""
+        while not game.is_hand_over():
+            seat = game.current_seat
+            if seat == LEARNER_SEAT:
+                return False
+            choice = self.opponents[seat - 1](game.decision())
+            if isinstance(choice, str):
+                game.act(choice)
+            else:
+                game.act(*choice)
+        return True
+
+    def _new_hand(self, i):
+        """Starts hands at table i until one reaches a learner decision."""
+        game = self.games[i]
+        while True:
+            for player in game.players:
+                player.chips = self.stack
+            game.start_hand()
+            if not self._play_opponents(game):
+                break
+        self._observe(i)
+
+    def _observe(self, i):
+        """Writes the learner's view of table i into the batch arrays."""
+        game = self.games[i]
+        player = game.players[LEARNER_SEAT]
+        row = self.observations[i]
+        row.fill(0.0)
+        for card in player.hand:
+            row[card.code] = 1.0
+        for card in game.community_cards:
+            row[52 + card.code] = 1.0
+        offset = 104
+        row[offset + _STREETS.index(game.phase)] = 1.0
+        offset += len(_STREETS)
+        to_call = max(game.current_highest_bet - player.current_bet, 0)
+        row[offset:offset + 5] = (game.pot, player.chips, player.current_bet, to_call, game.min_bet())
+        offset += 5
+        row[offset:] = [p.chips for p in game.players[1:]]
+        row[104 + len(_STREETS):] /= self.stack
+
+        legal = game.legal_actions(LEARNER_SEAT)
+        mask = self.action_mask[i]
+        mask[FOLD] = to_call > 0
+        mask[CHECK_CALL] = True
+        mask[BET_MIN] = mask[BET_POT] = 'bet' in legal
+        mask[ALL_IN] = 'all-in' in legal
@@ -0,0 +1,353 @@
+"""
+Asyncio multi-table poker server
+
+Hosts many HeadlessGame tables in one process. Each table runs in its own
+task, and players connect over a local TCP or Unix socket with a line-based
+protocol. Empty seats, and seats whose client times out or disconnects, are
+played by a bot agent, so a slow client only ever holds up its own table.
+
+Protocol (one space-separated message per line, cards as keys like 'As'):
+
+    client -> server
+        JOIN <table> <seat>
+        ACT <fold|check|call|bet|all-in> [amount]
+        LEAVE
+
+    server -> client
+        SEATED <table> <seat>
+        DEAL <table> <hand> <card> <card>
+        TURN <table> <seat> <pot> <to_call> <min_bet> <board|-> <legal,actions>
+        ACTION <table> <seat> <action> <amount>
+        BOARD <table> <cards>
+        RESULT <table> <net,results,per,seat>
+        ERR <message>
+
+Run with ``python -m src.server --tables 100 --port 8765``.
+"""
+
+import argparse
+import asyncio
+import random
+
+from src.game.agents import call_agent
+from src.game.card import card_from_key
+from src.game.engine import ACTIONS, HeadlessGame
+
+class Connection:
+    """A client socket with a bounded outgoing queue.
+
+    Messages are written by a separate task. A client that lets max_outbox
+    messages pile up is disconnected rather than slowing down its table.
+    """
+
+    def __init__(self, reader, writer, max_outbox):
+        """Wraps an accepted stream pair and starts its writer task."""
+        self.reader = reader
+        self.writer = writer
+        self.outbox = asyncio.Queue(max_outbox)
+        self.closed = False
+        self.seat = None  # (table, seat) once joined
+        self.writer_task = asyncio.create_task(self._pump())
+
+    def send(self, message):
+        """Queues a message without waiting; returns False if the client was dropped."""
+        if self.closed:
+            return False
+        try:
+            self.outbox.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.close()
+            return False
+
+    async def _pump(self):
+        """Writes queued messages to the socket."""
+        try:
+            while True:
+                message = await self.outbox.get()
+                self.writer.write(message.encode() + b'\n')
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        """Closes the socket and stops the writer task."""
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+            self.writer_task.cancel()
+
+class Table:
+    """One HeadlessGame table, played by connected clients and a bot."""
+
+    def __init__(self, table_id, seats, stack, action_timeout, rng, bot=call_agent, hand_delay=0.0):
+        """Creates the table; run() plays hands until cancelled."""
+        self.table_id = table_id
+        self.stack = stack
+        self.action_timeout = action_timeout
+        self.hand_delay = hand_delay
+        self.bot = bot
+        self.game = HeadlessGame([stack] * seats, rng=rng)
+        self.connections = [None] * seats
+        self.actions = asyncio.Queue(2 * seats)  # (seat, action, amount) from clients
+        self.awaiting = None  # Seat whose client is being waited on
+
+    def seat_connection(self, seat):
+        """Returns the live connection in a seat, or None if a bot plays it."""
+        connection = self.connections[seat]
+        return connection if connection is not None and not connection.closed else None
+
+    def broadcast(self, message):
+        """Sends a message to every connected client at the table."""
+        for connection in self.connections:
+            if connection is not None:
+                connection.send(message)
+
+    async def run(self):
+        """Plays hands forever, rebuying players who bust."""
+        game = self.game
+        while True:
+            for player in game.players:
+                if player.chips == 0:
+                    player.chips = self.stack
+            game.start_hand()
+            for seat, player in enumerate(game.players):
+                connection = self.seat_connection(seat)
+                if connection is not None:
+                    cards = ' '.join(card.get_key() for card in player.hand)
+                    connection.send(f"DEAL {self.table_id} {game.hands_played} {cards}")
+            board_size = 0
+            while not game.is_hand_over():
+                if len(game.community_cards) != board_size:
+                    board_size = len(game.community_cards)
+                    self.broadcast(f"BOARD {self.table_id} {self._board()}")
+                seat = game.current_seat
+                contributed = game.contributions[seat]
+                action, amount = await self._choose(seat)
+                amount_paid = game.contributions[seat] - contributed
+                self.broadcast(f"ACTION {self.table_id} {seat} {action} {amount_paid}")
+            results = ','.join(str(net) for net in game.net_results())
+            self.broadcast(f"RESULT {self.table_id} {results}")
+            await asyncio.sleep(self.hand_delay)  # Always yield to other tables between hands
+
+    def _clear_actions(self):
+        """Drops queued actions so late or duplicate messages cannot carry over to another turn."""
+        while not self.actions.empty():
+            self.actions.get_nowait()
+
+    def _board(self):
+        """Returns the board as a comma-separated list of card keys, or '-'."""
+        return ','.join(card.get_key() for card in self.game.community_cards) or '-'
+
+    async def _choose(self, seat):
+        """Gets and applies an action for seat from its client or the bot."""
+        game = self.game
+        connection = self.seat_connection(seat)
+        if connection is not None:
+            decision = game.decision()
+            connection.send(f"TURN {self.table_id} {seat} {decision.pot} {decision.to_call} "
+                            f"{decision.min_bet} {self._board()} {','.join(decision.legal_actions)}")
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.action_timeout
+            self.awaiting = seat
+            try:
+                while connection is not None:
+                    try:
+                        sender, action, amount = await asyncio.wait_for(self.actions.get(),
+                                                                        deadline - loop.time())
+                    except asyncio.TimeoutError:
+                        connection.send(f"ERR timed out at table {self.table_id}")
+                        break
+                    if sender != seat:  # Queued for an earlier turn
+                        continue
+                    if action is None:  # The client left
+                        break
+                    try:
+                        game.act(action, amount)
+                        return action, amount
+                    except ValueError as error:
+                        connection.send(f"ERR {error}")
+                    connection = self.seat_connection(seat)
+            finally:
+                self.awaiting = None
+                self._clear_actions()
+
+        choice = self.bot(game.decision())
+        action, amount = (choice, 0) if isinstance(choice, str) else choice
+        game.act(action, amount)
+        return action, amount
+
+class PokerServer:
+    """Runs many tables and routes client messages to them."""
+
+    def __init__(self, num_tables, seats=2, stack=1000, action_timeout=10.0, max_outbox=256,
+                 hand_delay=0.0, seed=None):
+        """Creates the tables; call start() to begin accepting clients."""
+        self.max_outbox = max_outbox
+        self.tables = [Table(i, seats, stack, action_timeout,
+                             random.Random(f"{seed}-{i}") if seed is not None else random.Random(),
+                             hand_delay=hand_delay)
+                       for i in range(num_tables)]
+        self.tasks = []
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        """Starts every table and listens on TCP, or on a Unix socket if path is given."""
+        self.tasks = [asyncio.create_task(table.run()) for table in self.tables]
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle_client, path)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server
+
+    async def stop(self):
+        """Stops accepting clients and cancels every table."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    async def handle_client(self, reader, writer):
+        """Reads one client's messages until it disconnects."""
+        connection = Connection(reader, writer, self.max_outbox)
+        try:
+            while not connection.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                self._handle_message(connection, line.decode(errors='replace').split())
+        except ConnectionError:
+            pass
+        finally:
+            self._leave(connection)
+            connection.close()
+
+    def _handle_message(self, connection, parts):
+        """Applies one client message."""
+        if not parts:
+            return
+        command = parts[0].upper()
+        if command == 'JOIN' and len(parts) == 3:
+            try:
+                table_id, seat = int(parts[1]), int(parts[2])
+            except ValueError:
+                connection.send(f"ERR bad message {' '.join(parts)}")
+                return
+            self._join(connection, table_id, seat)
+        elif command == 'ACT' and 2 <= len(parts) <= 3 and connection.seat is not None:
+            if parts[1] not in ACTIONS:
+                connection.send(f"ERR unknown action {parts[1]}")
+                return
+            table_id, seat = connection.seat
+            table = self.tables[table_id]
+            if table.awaiting != seat:
+                connection.send("ERR not your turn")
+                return
+            try:
+                amount = int(parts[2]) if len(parts) == 3 else 0
+            except ValueError:
+                connection.send(f"ERR bad amount {parts[2]}")
+                return
+            try:
+                table.actions.put_nowait((seat, parts[1], amount))
+            except asyncio.QueueFull:
+                connection.send("ERR table busy, action dropped")
+        elif command == 'LEAVE':
+            self._leave(connection)
+        else:
+            connection.send(f"ERR bad message {' '.join(parts)}")
+
+    def _join(self, connection, table_id, seat):
+        """Seats a connection at a table."""
+        if not 0 <= table_id < len(self.tables):
+            connection.send(f"ERR no table {table_id}")
+            return
+        table = self.tables[table_id]
+        if not 0 <= seat < len(table.connections) or table.seat_connection(seat) is not None:
+            connection.send(f"ERR seat {seat} unavailable")
+            return
+        self._leave(connection)
+        table.connections[seat] = connection
+        connection.seat = (table_id, seat)
+        connection.send(f"SEATED {table_id} {seat}")
+
+    def _leave(self, connection):
+        """Returns a connection's seat to the bot."""
+        if connection.seat is not None:
+            table_id, seat = connection.seat
+            table = self.tables[table_id]
+            if table.connections[seat] is connection:
+                table.connections[seat] = None
+                if table.awaiting == seat:
+                    try:
+                        table.actions.put_nowait((seat, None, 0))  # Wake the table for the bot
+                    except asyncio.QueueFull:
+                        pass
+            connection.seat = None
+
+class RemoteDecision:
+    """A Decision rebuilt by a client from a TURN message, for use with agents."""
+
+    __slots__ = ('seat', 'hand', 'community_cards', 'pot', 'to_call', 'min_bet', 'legal_actions')
+
+async def run_client(agent, table, seat, host='127.0.0.1', port=8765, path=None, hands=None):
+    """Connects to a server, sits at (table, seat) and plays with an agent
+    callable until the connection closes or hands hands have finished."""
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"JOIN {table} {seat}\n".encode())
+    hand = []
+    finished = 0
+    try:
+        while hands is None or finished < hands:
+            line = await reader.readline()
+            if not line:
+                break
+            parts = line.decode().split()
+            if parts[0] == 'DEAL':
+                hand = [card_from_key(key) for key in parts[3:]]
+            elif parts[0] == 'RESULT':
+                finished += 1
+            elif parts[0] == 'TURN':
+                decision = RemoteDecision()
+                decision.seat = int(parts[2])
+                decision.hand = hand
+                decision.pot, decision.to_call, decision.min_bet = (int(x) for x in parts[3:6])
+                decision.community_cards = [] if parts[6] == '-' else [card_from_key(k) for k in parts[6].split(',')]
+                decision.legal_actions = parts[7].split(',')
+                choice = agent(decision)
+                action, amount = (choice, 0) if isinstance(choice, str) else choice
+                writer.write(f"ACT {action} {amount}\n".encode())
+                await writer.drain()
+    finally:
+        writer.close()
+    return finished
+
+async def main():
+    """Parses command-line options and serves until interrupted."""
+    parser = argparse.ArgumentParser(description="Multi-table Texas Hold'em server")
+    parser.add_argument('--tables', type=int, default=100)
+    parser.add_argument('--seats', type=int, default=2)
+    parser.add_argument('--stack', type=int, default=1000)
+    parser.add_argument('--timeout', type=float, default=10.0, help="seconds a client has to act")
+    parser.add_argument('--hand-delay', type=float, default=0.0, help="pause between hands, in seconds")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="serve on this Unix socket path instead of TCP")
+    args = parser.parse_args()
+
+    server = PokerServer(args.tables, args.seats, args.stack, args.timeout, hand_delay=args.hand_delay)
+    listener = await server.start(args.host, args.port, args.unix)
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
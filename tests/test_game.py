@@ -0,0 +1,26 @@
+import builtins
+import random
+
+from src.game.evaluator import evaluate
+from src.game.game import Game
+from src.game.player import Player
+
+def _play(game, monkeypatch, answers):
+    """Plays a round answering betting prompts from answers, then 'check'."""
+    answers = iter(answers)
+    monkeypatch.setattr(builtins, 'input', lambda prompt='': next(answers, 'check'))
+    game.play_round()
+
+def test_showdown_uses_the_cards_players_hold(monkeypatch, capsys):
+    game = Game([Player(1, 1000), Player(2, 1000)], rng=random.Random(3))
+    for _ in range(3):
+        _play(game, monkeypatch, [])
+        for seat, player in enumerate(game.players):
+            codes = [card.code for card in player.hand + game.community_cards]
+            assert game.hand_strength(seat) == evaluate(codes)
+
+def test_chips_are_conserved_when_everyone_folds_to_the_last_player(monkeypatch, capsys):
+    players = [Player(i + 1, 1000) for i in range(3)]
+    game = Game(players, rng=random.Random(5))
+    _play(game, monkeypatch, ['fold', 'fold'])
+    assert sum(player.chips for player in players) == 3000
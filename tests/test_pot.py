@@ -0,0 +1,29 @@
+import random
+
+from src.game.pot import award_pots, build_pots
+
+def test_folded_chips_go_to_players_who_put_nothing_in():
+    pots = build_pots([20, 0, 10], [False, True, False])
+    assert [(pot.amount, pot.eligible) for pot in pots] == [(30, [1])]
+    pots = build_pots([20, 0, 0], [False, True, True])
+    assert [(pot.amount, pot.eligible) for pot in pots] == [(20, [1, 2])]
+
+def test_side_pots():
+    pots = build_pots([100, 30, 60, 0], [True, True, True, False])
+    assert [(pot.amount, pot.eligible) for pot in pots] == [(90, [0, 1, 2]), (60, [0, 2]), (40, [0])]
+
+def test_chips_are_conserved():
+    rng = random.Random(0)
+    for _ in range(5000):
+        seats = rng.randint(2, 9)
+        contributions = [rng.choice([0, 0, 10, 20, 35, 50, 100, rng.randint(0, 500)])
+                         for _ in range(seats)]
+        active = [rng.random() < 0.6 for _ in range(seats)]
+        if not any(active):
+            active[rng.randrange(seats)] = True
+        pots = build_pots(contributions, active)
+        assert sum(pot.amount for pot in pots) == sum(contributions)
+        strengths = {seat: rng.randint(0, 3) for seat in range(seats) if active[seat]}
+        payouts, _ = award_pots(pots, strengths, rng.randrange(seats), seats)
+        assert sum(payouts.values()) == sum(contributions)
+        assert all(active[seat] for seat in payouts)
@@ -0,0 +1,14 @@
+import pytest
+
+from src.game.preflop import MAX_OPPONENTS, hand_strength
+from src.game.ranges import Range
+
+@pytest.mark.parametrize('opponents', [0, MAX_OPPONENTS + 1])
+def test_opponents_out_of_range_are_rejected(opponents):
+    with pytest.raises(ValueError):
+        hand_strength([12, 25], opponents)
+    with pytest.raises(ValueError):
+        Range.top(10, opponents)
+
+def test_strength_grows_with_the_hand():
+    assert hand_strength([12, 25], MAX_OPPONENTS) > hand_strength([0, 14], MAX_OPPONENTS)